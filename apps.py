@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class WhitelabelConfig(AppConfig):
     name = 'apps.whitelabel'
+
+    def ready(self):
+        # Connects the signal handlers that keep WLDailySummary in sync.
+        from apps.whitelabel import wl_summary  # noqa: F401
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SponsoredLinksConfig(AppConfig):
+    name = 'apps.sponsored_links'
+
+    def ready(self):
+        # Connects the signal handlers that invalidate the zone ad preview and
+        # publisher index caches.
+        from apps.sponsored_links import publisher_index_cache, zone_ad_cache  # noqa: F401
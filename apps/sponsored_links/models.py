@@ -0,0 +1,33 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+
+class PublisherRevenueDomain(models.Model):
+    """
+    A publisher listed in a revenue domain's `crossroads_user_ids`. Kept in sync
+    by `apps.sponsored_links.publisher_domains`.
+    """
+    publisher = models.ForeignKey(User, related_name="+", on_delete=models.DO_NOTHING, db_constraint=False)
+    revenue_domain_id = models.IntegerField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["publisher", "revenue_domain_id"],
+                name="publisher_revenue_domain_unique",
+            ),
+        ]
+
+
+class PublisherRoutingDomain(models.Model):
+    """A publisher listed in a routing domain's `crossroads_user_ids`."""
+    publisher = models.ForeignKey(User, related_name="+", on_delete=models.DO_NOTHING, db_constraint=False)
+    routing_domain_id = models.IntegerField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["publisher", "routing_domain_id"],
+                name="publisher_routing_domain_unique",
+            ),
+        ]
@@ -0,0 +1,100 @@
+"""
+A management command used to (re)build the `WLDailySummary` table for a date
+range, e.g. after deploying the summary or after correcting revenue data.
+
+It extends the `BaseManagementCommand`.
+"""
+from datetime import datetime
+
+from django.core.management import CommandError
+from django.core.management.base import CommandParser
+from django.utils import timezone
+
+from apps.whitelabel.models import WLPublisher
+from apps.whitelabel.wl_summary import date_range, first_revenue_date, refresh_wl_daily_summary
+from core.management.commands.base import BaseManagementCommand
+
+
+class Command(BaseManagementCommand):
+    """
+    This rebuilds the `WLDailySummary` table in the database.
+    """
+    help = "Backfill the white label daily summary for a date range and optional configurations"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add command line arguments to the parser.
+
+        Args:
+            parser: The command argument parser
+        """
+        parser.add_argument(
+            "-sd", "--start-date",
+            type=str,
+            default=None,
+            help="Start date in YYYY-MM-DD format, defaults to the first revenue date of any white label publisher",
+        )
+        parser.add_argument(
+            "-ed", "--end-date",
+            type=str,
+            default=None,
+            help="End date in YYYY-MM-DD format, defaults to today",
+        )
+        parser.add_argument(
+            "-c", "--configuration",
+            type=int,
+            nargs="+",
+            default=None,
+            help="WhiteLabelConfiguration IDs, defaults to all",
+        )
+        parser.add_argument(
+            "--chunk-days",
+            type=int,
+            default=31,
+            help="Number of dates recomputed at once",
+        )
+
+    def handle(self, **options: str) -> None:
+        """Handle the command execution.
+
+        Args:
+            **options: Command line arguments
+        """
+        self.logger_start()
+
+        try:
+            configuration_ids = options["configuration"]
+            if options["start_date"]:
+                start_date = datetime.strptime(options["start_date"], "%Y-%m-%d").date()
+            else:
+                publishers = WLPublisher.objects.all()
+                if configuration_ids:
+                    publishers = publishers.filter(configuration_id__in=configuration_ids)
+                start_date = first_revenue_date(list(publishers.values_list("publisher_id", flat=True)))
+                if start_date is None:
+                    error_msg = "No white label publisher has revenue to backfill."
+                    raise CommandError(error_msg)
+            end_date = (
+                datetime.strptime(options["end_date"], "%Y-%m-%d").date()
+                if options["end_date"]
+                else timezone.now().date()
+            )
+
+            dates = date_range(start_date, end_date)
+            chunk_days = max(int(options["chunk_days"]), 1)
+            written = 0
+            for offset in range(0, len(dates), chunk_days):
+                chunk = dates[offset:offset + chunk_days]
+                written += refresh_wl_daily_summary(chunk, configuration_ids)
+                self.logger.info("Backfilled white label summary %s to %s", chunk[0], chunk[-1])
+
+            self.result["start_date"] = start_date.strftime("%Y-%m-%d")
+            self.result["end_date"] = end_date.strftime("%Y-%m-%d")
+            self.result["rows"] = written
+
+        except CommandError:
+            raise
+        except Exception as ex:  # noqa: BLE001
+            self.handle_exception(ex)
+
+        self.logger_end()
+        self.result_output()
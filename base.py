@@ -2,24 +2,145 @@
 This module contains the `BaseManagementCommand` class. It contains the common
 methods and attributes that are shared by the child classes.
 
+Every command accepts `--profile [FILE]`. It adds wall and CPU time, peak RSS
+and the DB query count and time per database alias to the result output, and
+with FILE also writes a cProfile (or pyinstrument, see `--profiler`) report.
+
 Classes:
+    CommandProfiler
+    Methods:
+        start
+        stop
     BaseManagementCommand
     Methods:
+        create_parser
+        execute
         get_command_name
         logger_start
         logger_end
         handle_exception
         result_output
 """
+import copy
+import cProfile
 import json
 import logging
+import resource
+import threading
+import time
 import traceback
+from collections import defaultdict
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
 
 from core.utilities import get_date_time_now
 
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+
+class CommandProfiler:
+    """
+    Collects resource metrics for one command run, and optionally a profile.
+
+    DB queries are counted with an execute wrapper on every connection open in
+    the command's thread, and on each connection opened afterwards, so queries
+    of worker threads are included.
+    """
+
+    def __init__(self, output_file: str | None = None, profiler: str = "cprofile") -> None:
+        self.output_file = output_file
+        self.profiler_name = profiler
+        self.queries = defaultdict(lambda: {"count": 0, "seconds": 0.0})
+        self._lock = threading.Lock()
+        self._profiler = None
+        self._wrapped = []
+        self._metrics = None
+
+    def _execute_wrapper(self, alias: str):  # noqa: ANN202
+        def wrapper(execute, sql, params, many, context):  # noqa: ANN001, ANN202
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self.queries[alias]["count"] += 1
+                    self.queries[alias]["seconds"] += elapsed
+        return wrapper
+
+    def _wrap(self, connection) -> None:  # noqa: ANN001
+        wrapper = self._execute_wrapper(connection.alias)
+        connection.execute_wrappers.append(wrapper)
+        self._wrapped.append((connection, wrapper))
+
+    def _connection_created(self, sender, connection, **kwargs) -> None:  # noqa: ANN001, ARG002
+        self._wrap(connection)
+
+    def start(self) -> None:
+        """Starts measuring."""
+        for connection in connections.all(initialized_only=True):
+            self._wrap(connection)
+        connection_created.connect(self._connection_created, weak=False)
+
+        if self.output_file:
+            if self.profiler_name == "pyinstrument":
+                self._profiler = pyinstrument.Profiler()
+                self._profiler.start()
+            else:
+                self._profiler = cProfile.Profile()
+                self._profiler.enable()
+
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def stop(self) -> dict:
+        """
+        Stops measuring, writes the profile file and returns the metrics.
+        Calling it again returns the same metrics.
+        """
+        if self._metrics is not None:
+            return self._metrics
+
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.process_time() - self._cpu_start
+
+        if self._profiler is not None:
+            if self.profiler_name == "pyinstrument":
+                self._profiler.stop()
+                with open(self.output_file, "w", encoding="utf8") as file:
+                    file.write(self._profiler.output_html())
+            else:
+                self._profiler.disable()
+                self._profiler.dump_stats(self.output_file)
+
+        connection_created.disconnect(self._connection_created)
+        for connection, wrapper in self._wrapped:
+            if wrapper in connection.execute_wrappers:
+                connection.execute_wrappers.remove(wrapper)
+
+        with self._lock:
+            queries = {
+                alias: {"count": stats["count"], "seconds": round(stats["seconds"], 3)}
+                for alias, stats in sorted(self.queries.items())
+            }
+
+        self._metrics = {
+            "wall_seconds": round(wall, 3),
+            "cpu_seconds": round(cpu, 3),
+            # ru_maxrss is reported in kilobytes on Linux.
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            "queries": queries,
+        }
+        if self.output_file:
+            self._metrics["profile_file"] = self.output_file
+        return self._metrics
+
 
 class BaseManagementCommand(BaseCommand):
     """
@@ -29,6 +150,52 @@ class BaseManagementCommand(BaseCommand):
     help = "The base management command shared with child classes."
     result = {"status": True}
     logger = logging.getLogger("management_commands")
+    profiler = None
+
+    def create_parser(self, prog_name: str, subcommand: str, **kwargs):  # noqa: ANN003, ANN201
+        """
+        Adds the `--profile` and `--profiler` arguments shared by every command.
+        """
+        parser = super().create_parser(prog_name, subcommand, **kwargs)
+        parser.add_argument(
+            "--profile",
+            nargs="?",
+            const="",
+            default=None,
+            metavar="FILE",
+            help="Add resource metrics to the result, and write a profile to FILE if given",
+        )
+        parser.add_argument(
+            "--profiler",
+            choices=["cprofile", "pyinstrument"],
+            default="cprofile",
+            help="The profiler used for --profile FILE",
+        )
+        return parser
+
+    def execute(self, *args: str, **options: str):  # noqa: ANN201
+        """
+        Runs the command, measured by a `CommandProfiler` when `--profile` is set.
+        """
+        # Every run starts from a copy of the class defaults, so keys written
+        # during one run (e.g. "profile") never leak into later runs.
+        self.result = copy.deepcopy(type(self).result)
+
+        if options.get("profile") is None:
+            return super().execute(*args, **options)
+
+        if options["profile"] and options["profiler"] == "pyinstrument" and pyinstrument is None:
+            error_msg = "pyinstrument is not installed."
+            raise CommandError(error_msg)
+
+        self.profiler = CommandProfiler(options["profile"] or None, options["profiler"])
+        self.profiler.start()
+        try:
+            return super().execute(*args, **options)
+        finally:
+            metrics = self.profiler.stop()
+            self.profiler = None
+            self.logger.info("%s profile: %s", self.get_command_name(), json.dumps(metrics))
 
     def get_command_name(self) -> str:
         """
@@ -75,6 +242,9 @@ class BaseManagementCommand(BaseCommand):
     def result_output(self) -> None:
         """
         Output the final result of the command execution.
-        Writes the result dictionary as JSON to stdout.
+        Writes the result dictionary as JSON to stdout, including the
+        `--profile` metrics when profiling.
         """
+        if self.profiler is not None:
+            self.result["profile"] = self.profiler.stop()
         self.stdout.write(json.dumps(self.result))
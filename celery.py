@@ -17,3 +17,7 @@ app = Celery(
 # pickle the object when using Windows.
 app.config_from_object("django.conf:settings")
 app.autodiscover_tasks(lambda: settings.INSTALLED_APPS)
+# The white label summary refresh task and its revenue ingestion signal handler.
+app.autodiscover_tasks(["apps.whitelabel"], related_name="wl_summary")
+# Keeps the publisher to domain associations in sync with crossroads_user_ids.
+app.autodiscover_tasks(["apps.sponsored_links"], related_name="publisher_domains")
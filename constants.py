@@ -84,6 +84,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apps.main_app.tasks.score_keywords",
         "schedule": crontab(minute="30", hour="1"),
     },
+    "sync_publisher_domains": {
+        "task": "apps.sponsored_links.publisher_domains.sync_publisher_domains",
+        "schedule": crontab(minute="*/10"),
+    },
     "link_unassigned_ads": {
         "task": "apps.main_app.tasks.link_unassigned_ads",
         "schedule": crontab(minute="0", hour="7"),
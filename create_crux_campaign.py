@@ -2,6 +2,7 @@ from datetime import datetime
 from apps.data.trafficguard.models import Campaigns, Categories, RevenueDomains, RevenueProviders
 from apps.sponsored_links_reporting.models import TrafficGuardCampaign
 from apps.sponsored_links_reporting.models import Category
+from apps.sponsored_links.publisher_domains import link_revenue_domain
 from apps.main_app.providers.trafficguard import create_domain, create_campaign, add_user_to_domain
 
 class CreateCruxCampaign:
@@ -107,7 +108,19 @@ class CreateCruxCampaign:
 
             if user_id not in domain.get_crossroad_user_ids():
                 add_user_to_domain(domain.id, user_id)
+            # Only record the link, the domain row above is the source of truth.
+            link_revenue_domain(user_id, domain.id)
 
             return domain.name
 
+        # Record the new domain right away if it has synced already, otherwise
+        # the next sync_publisher_domains run picks it up.
+        domain_id = (
+            RevenueDomains.objects.filter(name=crux_article_url)
+            .values_list("id", flat=True)
+            .first()
+        )
+        if domain_id:
+            link_revenue_domain(user_id, domain_id)
+
         return crux_article_url
@@ -0,0 +1,77 @@
+"""
+A management command that creates the pg_trgm indexes used by the sponsored
+links typeahead search endpoints.
+
+The searched tables (users, keywords and revenue domains) belong to other apps,
+so the indexes are created here with idempotent SQL on the database each model
+is routed to instead of through migrations. Indexes are built concurrently so
+the command can run against live databases.
+
+The typeahead filters on `UPPER(column)`, so that expression is indexed; an
+index on the bare column could not serve the search. The search itself uses the
+`trigram_similar` lookup, registered by `django.contrib.postgres`, so the
+command refuses to run unless that app is in `INSTALLED_APPS`.
+
+It extends the `BaseManagementCommand`.
+"""
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.management import CommandError
+from django.db import connections, router
+
+from apps.data.trafficguard.models import RevenueDomains
+from apps.sponsored_links_reporting.models import KeywordNew
+from core.management.commands.base import BaseManagementCommand
+
+# (model, searched field)
+SEARCH_INDEXES = (
+    (User, "username"),
+    (KeywordNew, "keyword"),
+    (RevenueDomains, "name"),
+)
+
+
+class Command(BaseManagementCommand):
+    """
+    Creates the trigram indexes of the typeahead search endpoints.
+    """
+    help = "Create the pg_trgm indexes used by the sponsored links typeahead search."
+
+    def handle(self, **options: str) -> None:  # noqa: ARG002
+        """Handle the command execution.
+
+        Args:
+            **options: Command line arguments
+        """
+        if not apps.is_installed("django.contrib.postgres"):
+            error_msg = (
+                "django.contrib.postgres must be in INSTALLED_APPS, "
+                "the typeahead search uses its trigram_similar lookup."
+            )
+            raise CommandError(error_msg)
+
+        self.logger_start()
+        self.result["indexes"] = []
+
+        try:
+            for model, field_name in SEARCH_INDEXES:
+                alias = router.db_for_write(model)
+                table = model._meta.db_table
+                column = model._meta.get_field(field_name).column
+                index_name = f"{table}_{column}_upper_trgm"[:63]
+
+                with connections[alias].cursor() as cursor:
+                    cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                    cursor.execute(
+                        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{index_name}" '
+                        f'ON "{table}" USING gin ((UPPER("{column}")) gin_trgm_ops)'
+                    )
+
+                self.logger.info("Ensured index %s on %s", index_name, alias)
+                self.result["indexes"].append({"database": alias, "index": index_name})
+
+        except Exception as ex:  # noqa: BLE001
+            self.handle_exception(ex)
+
+        self.logger_end()
+        self.result_output()
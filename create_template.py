@@ -8,8 +8,8 @@ from django.utils.decorators import method_decorator
 from django.views import View
 
 from apps.admin._trafficguard.decorators import json_form_request
-from apps.sponsored_links import fileutils
 from apps.sponsored_links.forms.create_template_request import CreateTemplateRequest
+from apps.sponsored_links.template_storage import get_template_storage
 from apps.sponsored_links_reporting.models import Template
 
 LOGGER = logging.getLogger(__name__)
@@ -50,10 +50,10 @@ class CreateTemplate(LoginRequiredMixin, View):
             snippet_variables=data.get("variables")
         )
 
-        # Attempt to upload the HTML to S3
+        # Attempt to store the HTML
         try:
             if html:
-                fileutils.upload_to_s3_raw(html, path)
+                get_template_storage().write(path, html, new=True)
 
         except Exception as ex:
             LOGGER.error(f"Error uploading file to S3: {ex}")
@@ -3,6 +3,9 @@ from datetime import date
 from myapp.models import WhiteLabelConfiguration, WLPublisher, WLShareRule
 
 from django.core.management.base import BaseCommand
+from django.db.models import Min
+
+from apps.whitelabel.wl_summary import queue_publisher_refresh
 
 
 class Command(BaseCommand):
@@ -17,7 +20,12 @@ class Command(BaseCommand):
             publishers = WLPublisher.objects.filter(configuration=config).values_list("publisher", flat=True)
 
             # Reset revenue share
-            WLShareRule.objects.filter(owner_id__in=publishers).update(percentage=1.0)
+            rules = WLShareRule.objects.filter(owner_id__in=publishers)
+            first_effective = rules.aggregate(Min("date_effective"))["date_effective__min"]
+            rules.update(percentage=1.0)
+            # The bulk update bypasses the share rule signals, so refresh the summary explicitly.
+            if first_effective is not None:
+                queue_publisher_refresh(list(publishers), first_effective)
 
             # Deactivate configuration
             config.active = False
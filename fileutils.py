@@ -1,7 +1,79 @@
-import time, uuid, boto3
+import hashlib, threading, time, uuid, boto3
+from collections import OrderedDict, namedtuple
+from botocore.exceptions import ClientError
 from django.conf import settings
 
 BUCKET_NAME = 'sl-templates'
+CONTENT_HASH_METADATA = 'content-sha256'
+
+_client_lock = threading.Lock()
+_s3_client = None
+
+CachedTemplate = namedtuple('CachedTemplate', ['etag', 'body', 'size', 'validated_at'])
+
+
+class TemplateCache:
+    """
+    Process-wide LRU cache of template bodies keyed by S3 key.
+    Entries are evicted least recently used first once the cached bodies
+    exceed max_bytes. Every read revalidates the entry with a conditional
+    GET against its ETag, so unchanged templates are not downloaded again.
+
+    ttl (TEMPLATE_CACHE_TTL, default 0) is an opt-in staleness window: entries
+    younger than ttl seconds are served without contacting S3. Invalidation is
+    local to the process, so with ttl > 0 other processes may serve a replaced
+    template for up to ttl seconds.
+    """
+
+    def __init__(self, max_bytes, ttl):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, etag, body):
+        size = len(body.encode('utf8'))
+        with self._lock:
+            self._pop(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = CachedTemplate(etag, body, size, time.monotonic())
+            self.size += size
+            while self.size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def touch(self, key):
+        """ marks an entry as freshly validated """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = entry._replace(validated_at=time.monotonic())
+
+    def is_fresh(self, entry):
+        return self.ttl > 0 and time.monotonic() - entry.validated_at < self.ttl
+
+    def invalidate(self, key):
+        with self._lock:
+            self._pop(key)
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+
+template_cache = TemplateCache(
+    max_bytes=getattr(settings, 'TEMPLATE_CACHE_MAX_BYTES', 32 * 1024 * 1024),
+    ttl=getattr(settings, 'TEMPLATE_CACHE_TTL', 0),
+)
 
 
 def clean_path(path):
@@ -9,28 +81,45 @@ def clean_path(path):
 
 
 def _client():
-    """ returns s3 client """
-    return boto3.client(
-        's3',
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
-    )
+    """ returns the shared s3 client, boto3 clients are thread safe """
+    global _s3_client
+    if _s3_client is None:
+        with _client_lock:
+            if _s3_client is None:
+                _s3_client = boto3.client(
+                    's3',
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
+                )
+    return _s3_client
 
-def _resource():
-    """ returns s3 resource """
-    return boto3.resource(
-        's3',
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
-    )
 
 def get_file(template):
-    """ gets file from s3 data store """
-    obj = _client().get_object(
-        Bucket=BUCKET_NAME,
-        Key=clean_path(template.path)
-    )
+    """ gets a template's file from the template cache or the s3 data store """
+    return read_file(template.path)
+
+
+def read_file(filename):
+    """ gets file from the template cache or the s3 data store """
+    key = clean_path(filename)
+    cached = template_cache.get(key)
+    if cached is not None and template_cache.is_fresh(cached):
+        return cached.body
+
+    params = {'Bucket': BUCKET_NAME, 'Key': key}
+    if cached is not None:
+        params['IfNoneMatch'] = cached.etag
+
+    try:
+        obj = _client().get_object(**params)
+    except ClientError as ex:
+        if cached is not None and ex.response['Error']['Code'] in ('304', 'NotModified'):
+            template_cache.touch(key)
+            return cached.body
+        raise
+
     file = obj.get('Body').read().decode('utf8')
+    template_cache.set(key, obj.get('ETag'), file)
     return file
 
 
@@ -50,44 +139,90 @@ def store_file(file, use_timestamp=True):
     else:
         filename = file.name
 
-    return upload_to_s3(file, filename)
+    return upload_to_s3(file, filename, new=use_timestamp)
 
 
 def copy_file(key):
     new_key = uuid.uuid4().hex.upper()[0:6]
-    _resource().Object(
-        BUCKET_NAME, new_key
-    ).copy_from(CopySource='{}/{}'.format(BUCKET_NAME, key))
+    _client().copy_object(
+        Bucket=BUCKET_NAME,
+        Key=new_key,
+        CopySource={'Bucket': BUCKET_NAME, 'Key': key}
+    )
     return new_key
 
 
-def upload_to_s3(target_file, filename):
-    """ uploads file to amazon s3 and returns file key """
-    key = clean_path(filename)
-    delete(key)
-    _client().put_object(
+def content_hash(data):
+    """ returns the sha256 hex digest of a file body """
+    if isinstance(data, str):
+        data = data.encode('utf8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def _head(key):
+    """ returns the head_object response of an s3 key, None if it does not exist """
+    try:
+        return _client().head_object(Bucket=BUCKET_NAME, Key=key)
+    except ClientError as ex:
+        if ex.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+            return None
+        raise
+
+
+def stored_content_hash(filename):
+    """ returns the content hash recorded on an s3 object, None if unknown or missing """
+    head = _head(clean_path(filename))
+    if head is None:
+        return None
+    return head.get('Metadata', {}).get(CONTENT_HASH_METADATA)
+
+
+def put_file(key, body, new=False):
+    """
+    writes body to key in a single put_object call, which replaces an existing
+    object atomically. an overwrite first asks s3 for the content hash stored
+    on the object, and a body with the same hash is not uploaded again.
+    new: bool, key was just generated, so there is nothing to compare against
+    returns: bool, whether the object was written
+    """
+    body_hash = content_hash(body)
+    if not new:
+        head = _head(key)
+        if head is not None and head.get('Metadata', {}).get(CONTENT_HASH_METADATA) == body_hash:
+            if isinstance(body, str):
+                template_cache.set(key, head.get('ETag'), body)
+            return False
+    response = _client().put_object(
         Bucket=BUCKET_NAME,
         Key=key,
-        Body=target_file.read()
+        Body=body,
+        Metadata={CONTENT_HASH_METADATA: body_hash}
     )
+    if isinstance(body, str):
+        # the next read of this process revalidates with a 304 instead of downloading
+        template_cache.set(key, response.get('ETag'), body)
+    else:
+        template_cache.invalidate(key)
+    return True
+
+
+def upload_to_s3(target_file, filename, new=False):
+    """ uploads file to amazon s3 and returns file key """
+    key = clean_path(filename)
+    put_file(key, target_file.read(), new=new)
     return key
 
 
 def upload_to_s3_raw(raw_data, filename):
     """ uploads file to amazon s3 and returns file key """
-    key = clean_path(filename)
-    delete(key)
-    _client().put_object(
-        Bucket=BUCKET_NAME,
-        Key=key,
-        Body=raw_data
-    )
+    put_file(clean_path(filename), raw_data)
     return filename
 
 
 def delete(filename):
     """ deletes files from s3 """
     key = clean_path(filename)
+    template_cache.invalidate(key)
     _client().delete_object(
         Bucket=BUCKET_NAME,
         Key=key
@@ -0,0 +1,61 @@
+import time
+
+from celery.result import AsyncResult
+from django.conf import settings
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse
+from django.views import View
+
+from apps.sponsored_links.tasks import AD_CREATION_STAGES, get_ad_creation_job
+
+
+class LoadCreateAdProgress(LoginRequiredMixin, View):
+    """
+    Loads the progress of a queued CreateAd job.
+
+    Only the user who queued the job can read its progress. Celery reports
+    unknown and expired task IDs as PENDING, so a job that is unknown, or still
+    pending after `CREATE_AD_JOB_PENDING_TIMEOUT` seconds, is reported as a
+    terminal error instead.
+
+    Args:
+        job_id(str): The Celery task ID returned by CreateAd.
+
+    Return:
+        JsonResponse: job state, per-stage status and per-ad sync results.
+    """
+
+    def get(self, request, job_id) -> JsonResponse:
+        record = get_ad_creation_job(job_id)
+        if record is None:
+            return JsonResponse(
+                {"job_id": job_id, "status": "error", "message": "Unknown or expired job."},
+                status=404,
+            )
+        if record["user_id"] != request.user.id:
+            return JsonResponse(
+                {"job_id": job_id, "status": "error", "message": "No permission to access this job."},
+                status=403,
+            )
+
+        job = AsyncResult(job_id)
+        progress = {
+            "job_id": job_id,
+            "state": job.state,
+            "stages": dict.fromkeys(AD_CREATION_STAGES, "pending"),
+            "ads": [],
+        }
+
+        if job.state == "PROGRESS":
+            progress.update(job.info or {})
+        elif job.state == "SUCCESS":
+            # The task reports its own errors, so a finished job may still have failed.
+            progress.update(job.result)
+        elif job.state == "FAILURE":
+            progress.update({"status": "error", "message": str(job.result)})
+        elif job.state == "PENDING" and (
+            time.time() - record["queued_at"] > getattr(settings, "CREATE_AD_JOB_PENDING_TIMEOUT", 600)
+        ):
+            progress.update({"status": "error", "message": "The job did not start in time."})
+
+        return JsonResponse(progress)
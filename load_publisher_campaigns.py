@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import JsonResponse
@@ -6,10 +8,9 @@ from apps.sponsored_links_reporting.models import (
     AdContainer,
     AdZone,
 )
-from django.db.models import Prefetch, Subquery
+from django.db.models import Prefetch
 from apps.data.trafficguard.models import (
     RevenueDomains,
-    RedirectionRules,
     RedirectionRuleRevenueDomains,
 )
 
@@ -47,44 +48,64 @@ class LoadPublisherCampaigns(LoginRequiredMixin, View):
             )
             .order_by("name")
         )
+        revenue_domain_names = get_revenue_domain_names(
+            [campaign.id for campaign in tg_campaigns]
+        )
         campaigns = []
 
         for campaign in tg_campaigns:
 
-            category = campaign.categories.first()
+            # Read from the prefetch cache, .first() would run a query per campaign
+            category = min(campaign.categories.all(), key=lambda c: c.pk, default=None)
             ad_containers = campaign.adcontainer_set.all()
 
-            redirection_rules = RedirectionRules.objects.filter(campaign_id=campaign.id)
-
-            # Step 2: Extract the revenue_domain_ids and filter RevenueDomains
-            # Here we assume revenue_domain_ids are stored as comma-separated values in a text field
-            revenue_domain_names = RevenueDomains.objects.filter(
-                id__in=Subquery(
-                    RedirectionRuleRevenueDomains.objects.filter(
-                        redirection_rule__in=redirection_rules
-                    ).values('revenue_domain_id')
-                )
-            ).values_list('name', flat=True)
-
-            sites = ''
-            zones = ''
-
-            for container in ad_containers:
-                sites = f"{sites} {container.zone.site.name}"
-                zones = f"{zones} {container.zone.name}"
-
-            for domain in revenue_domain_names:
-                sites = f"{sites} {domain}"
+            sites = [container.zone.site.name for container in ad_containers]
+            sites.extend(revenue_domain_names.get(campaign.id, []))
+            zones = [container.zone.name for container in ad_containers]
 
             _campaign = {
                 "id": campaign.id,
                 "name": campaign.name,
                 "routing_domain": campaign.routing_domain,
                 "category": category.name if category else None,
-                "site": sites,
-                "zone": zones,
+                "site": "".join(f" {site}" for site in sites),
+                "zone": "".join(f" {zone}" for zone in zones),
             }
 
             campaigns.append(_campaign)
 
         return JsonResponse(campaigns, safe=False)
+
+
+def get_revenue_domain_names(campaign_ids: list) -> dict:
+    """
+    Loads the revenue domain names of the redirection rules of many campaigns.
+
+    Args:
+        campaign_ids(list): TrafficGuardCampaign IDs.
+
+    Return:
+        dict: campaign ID mapped to its revenue domain names.
+    """
+    rule_domains = list(
+        RedirectionRuleRevenueDomains.objects.filter(
+            redirection_rule__campaign_id__in=campaign_ids
+        )
+        .values_list("redirection_rule__campaign_id", "revenue_domain_id")
+        .distinct()
+    )
+    names = dict(
+        RevenueDomains.objects.filter(
+            id__in={domain_id for _, domain_id in rule_domains}
+        ).values_list("id", "name")
+    )
+
+    domains_by_campaign = defaultdict(list)
+    for campaign_id, domain_id in rule_domains:
+        if domain_id in names:
+            domains_by_campaign[campaign_id].append(names[domain_id])
+
+    return {
+        campaign_id: sorted(domain_names)
+        for campaign_id, domain_names in domains_by_campaign.items()
+    }
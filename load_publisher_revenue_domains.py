@@ -2,6 +2,7 @@ from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import JsonResponse
 from apps.data.trafficguard.models import RevenueDomains
+from apps.sponsored_links.publisher_domains import get_revenue_domain_ids
 
 class LoadPublisherRevenueDomains(LoginRequiredMixin, View):
     """
@@ -17,11 +18,10 @@ class LoadPublisherRevenueDomains(LoginRequiredMixin, View):
     def get(self, request, user_id) -> JsonResponse:
         domains = list(
             RevenueDomains.objects.filter(
-                is_deleted=False, name__icontains=request.GET.get("search", "")
+                id__in=get_revenue_domain_ids(user_id),
+                is_deleted=False,
+                name__icontains=request.GET.get("search", ""),
             )
-            .filter(crossroads_user_ids__regex=r"(\[|,){}(\]|,)".format(user_id))
-            .exclude(crossroads_user_ids=None)
-            .exclude(crossroads_user_ids="[]")
             .values("name", "revenue_provider_id", "id")
             .order_by("name")
         )
@@ -1,9 +1,9 @@
 from apps.data.trafficguard.models import RoutingDomains
 from apps.data.models import UserProfile
+from apps.sponsored_links.publisher_domains import get_routing_domain_ids
 from apps.admin._trafficguard.campaign_wizard.utils import (
     publisher_only_access,
 )
-from django.db.models import Q
 from django.http import JsonResponse
 from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -25,12 +25,7 @@ class LoadPublisherRoutingDomains(LoginRequiredMixin, View):
         publisher_profile = UserProfile.objects.get(owner=user_id)
 
         domains = RoutingDomains.objects.filter(
-            Q(crossroads_user_ids="[{}]".format(publisher_profile.owner_id))
-            | Q(crossroads_user_ids__contains=",{}]".format(publisher_profile.owner_id))
-            | Q(crossroads_user_ids__contains=",{},".format(publisher_profile.owner_id))
-            | Q(
-                crossroads_user_ids__contains="[{},".format(publisher_profile.owner_id)
-            ),
+            id__in=get_routing_domain_ids(publisher_profile.owner_id),
             is_deleted=False,
         )
         if (
@@ -38,16 +33,14 @@ class LoadPublisherRoutingDomains(LoginRequiredMixin, View):
             and publisher_profile.default_routing_domain_id
         ):
             domains = domains.filter(id=publisher_profile.default_routing_domain_id)
-        rows = []
-        for d in domains:
-            if publisher_profile.owner_id in d.get_crossroads_user_ids():
-                rows.append(
-                    {
-                        "id": d.id,
-                        "name": d.name,
-                        "default_domain": d.default_domain,
-                        "https": d.is_https,
-                    }
-                )
+        rows = [
+            {
+                "id": d.id,
+                "name": d.name,
+                "default_domain": d.default_domain,
+                "https": d.is_https,
+            }
+            for d in domains
+        ]
 
         return JsonResponse(rows, safe=False)
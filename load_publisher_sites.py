@@ -2,9 +2,8 @@ from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import JsonResponse
 from apps.sponsored_links_reporting.models import Site, AdZone
-import pandas
-from django.db.models import Count
-from apps.main_app.helpers import df_to_list_dict
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
 class LoadPublisherSites(LoginRequiredMixin, View):
     """
@@ -17,21 +16,22 @@ class LoadPublisherSites(LoginRequiredMixin, View):
         JsonResponse: List of sites.
     """
     def get(self, request, user_id) -> JsonResponse:
-        sites = pandas.DataFrame(
-            data=list(
-                Site.objects.filter(user_id=user_id, deleted=False)
-                .values("id", "name")
-                .order_by("name")
-            ),
-            columns=["id", "name"],
+        zone_counts = (
+            AdZone.objects.filter(site_id=OuterRef("id"))
+            .order_by()
+            .values("site_id")
+            .annotate(zone_count=Count("id"))
+            .values("zone_count")
         )
 
-        zones = pandas.DataFrame(data=list(AdZone.objects.exclude(site__deleted=True).values('site_id').annotate(zone_count=Count("id"))))
-        zones.rename(columns={ "site_id": "id", "zone_count": "zones" }, inplace=True)
-
-        dataframe = pandas.merge(sites, zones, on="id", how="left").fillna(0)
+        sites = (
+            Site.objects.filter(user_id=user_id, deleted=False)
+            .annotate(zones=Coalesce(Subquery(zone_counts), 0))
+            .values("id", "name", "zones")
+            .order_by("name")
+        )
 
         return JsonResponse(
-            df_to_list_dict(dataframe),
+            list(sites),
             safe=False,
         )
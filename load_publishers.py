@@ -3,11 +3,11 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import JsonResponse
 from django.contrib.auth.models import User
 from apps.data.models import UserAccess
-import pandas
+from apps.sponsored_links import publisher_index_cache
 from apps.sponsored_links_reporting.models import TrafficGuardCampaign
 from apps.sponsored_links_reporting.models import Site
-from django.db.models import Count
-from apps.main_app.helpers import df_to_list_dict
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
 class LoadPublishers(LoginRequiredMixin, View):
     """
@@ -24,10 +24,8 @@ class LoadPublishers(LoginRequiredMixin, View):
             is_active=True,
         )
 
-        users = []
-
         # admin profile filters go here - account manager restrictions
-        publisher_ids = UserAccess.objects.filter(owner=request.user).values_list('publisher_id', flat=True)
+        publisher_ids = list(UserAccess.objects.filter(owner=request.user).values_list('publisher_id', flat=True))
         if publisher_ids and not request.user.has_perm('data.super_admin'):
             filters['id__in'] = publisher_ids
 
@@ -52,51 +50,41 @@ class LoadPublishers(LoginRequiredMixin, View):
                 'id': request.user.id
             }
 
-        users = pandas.DataFrame(
-            data=list(
-                User.objects.filter(**filters)
-                .order_by("username")
-                .values("id", "username")
-                .distinct()
-            ),
-            columns=["id", "username"]
-        )
+        if 'id__in' in filters:
+            filters['id__in'] = sorted(filters['id__in'])
 
-        campaigns = pandas.DataFrame(
-            data=list(
+        def load_publishers():
+            campaigns = (
                 TrafficGuardCampaign.objects.filter(
+                    user_id=OuterRef("id"),
                     is_deleted=False,
                     version=TrafficGuardCampaign.VERSION_1,
                 )
+                .order_by()
                 .values("user_id")
                 .annotate(campaign_count=Count("id"))
-            ),
-            columns=["user_id", "campaign_count"]
-        )
-
-        campaigns.rename(columns={"user_id": "id", "campaign_count": "campaigns"}, inplace=True)
-
-        sites = pandas.DataFrame(
-            data=list(
-                Site.objects.filter(deleted=False)
-                .exclude(user_id=None)
+                .values("campaign_count")
+            )
+            sites = (
+                Site.objects.filter(user_id=OuterRef("id"), deleted=False)
+                .order_by()
                 .values("user_id")
                 .annotate(site_count=Count("id"))
-            ),
-            columns=["user_id", "site_count"],
-        )
-
-        sites.rename(columns={"user_id": "id", "site_count": "sites"}, inplace=True)
-
-        results = pandas.merge(users, sites, on="id", how="left").fillna('0')
-        results = (
-            pandas.merge(results, campaigns, on="id", how="left")
-            .fillna(0)
-            .reset_index()
-        )
-        results = results[results['campaigns'] > 0]
+                .values("site_count")
+            )
+            return list(
+                User.objects.filter(**filters)
+                .annotate(
+                    campaigns=Coalesce(Subquery(campaigns), 0),
+                    sites=Coalesce(Subquery(sites), 0),
+                )
+                .filter(campaigns__gt=0)
+                .order_by("username")
+                .values("id", "username", "sites", "campaigns")
+                .distinct()
+            )
 
         return JsonResponse(
-            df_to_list_dict(results),
+            publisher_index_cache.get_or_set(filters, load_publishers),
             safe=False,
         )
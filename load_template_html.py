@@ -4,7 +4,7 @@ from django.http import JsonResponse, HttpResponse
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views import View
 
-from apps.sponsored_links import fileutils
+from apps.sponsored_links.template_storage import get_template_storage
 from apps.sponsored_links_reporting.models import Template
 
 LOGGER = logging.getLogger(__name__)
@@ -12,7 +12,7 @@ LOGGER = logging.getLogger(__name__)
 
 class LoadTemplateHtml(LoginRequiredMixin, View):
     """
-    Retrieves the template HTML from its S3 location and returns it.
+    Retrieves the template HTML from the template storage and returns it.
 
     Return:
         JsonResponse: html content
@@ -26,7 +26,7 @@ class LoadTemplateHtml(LoginRequiredMixin, View):
 
         try:
             template = Template.objects.get(id=template_id)
-            html = fileutils.get_file(template)
+            html = get_template_storage().read(template.path)
 
             return HttpResponse(html, content_type="text/html")
 
@@ -4,7 +4,7 @@ from django.http import JsonResponse, HttpResponse
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views import View
 
-from apps.sponsored_links import fileutils
+from apps.sponsored_links.zone_ad_cache import get_rendered_container_html
 from apps.sponsored_links_reporting.models import AdContainer
 
 LOGGER = logging.getLogger(__name__)
@@ -25,18 +25,8 @@ class LoadZoneAdHtml(LoginRequiredMixin, View):
             return JsonResponse({"error": "Ad Container ID not provided."}, status=400)
 
         try:
-            ad_container = AdContainer.objects.get(id=ad_container_id)
-
-            keywords = ad_container.keywords.all()
-            keyword_context = {}
-
-            for idx, keyword in enumerate(keywords):
-                keyword_context[f"{{{{links.{idx}.keyword}}}}"] = keyword.keyword
-
-            html = fileutils.get_file(ad_container.template)
-
-            for placeholder, keyword_value in keyword_context.items():
-                html = html.replace(placeholder, keyword_value)
+            ad_container = AdContainer.objects.select_related("template").get(id=ad_container_id)
+            html = get_rendered_container_html(ad_container)
 
             return HttpResponse(html, content_type="text/html")
 
@@ -28,7 +28,7 @@ class LoadZoneAds(LoginRequiredMixin, View):
                 "id": container.id,
                 "name": container.name,
                 "title": container.title,
-                "zone_id": container.zone.id
+                "zone_id": container.zone_id
             }
             for container in ad_containers
         ]
@@ -1,20 +1,48 @@
 """
 Contains the `AdministrationAuthenticationMiddleware` responsible for ensuring
 all access to the Django Admin site is only done via authenticated and
-authorized users.
+authorized users, and the `PerformanceMiddleware` that measures the wall time
+and SQL usage of each request.
 
 Classes:
     AdministrationAuthenticationMiddleware
     Methods:
         get_user
+    QueryRecorder
+    Methods:
+        __call__
+        summary
+    MeasuredStream
+    Methods:
+        close
+    PerformanceMiddleware
+    Methods:
+        get_view_name
+        get_budget
+        server_timing
+        record
 """
+import json
+import logging
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack
 from urllib.parse import urlencode
 
 from django.conf import settings
 from django.contrib.auth import get_user
-from django.http import HttpRequest
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect
 
+PERFORMANCE_LOGGER = logging.getLogger("performance")
+
+DEFAULT_PERFORMANCE_BUDGET = {
+    "wall_ms": 2000,
+    "queries": 100,
+    "duplicate_queries": 20,
+}
+
 
 class AdministrationAuthenticationMiddleware:
     """
@@ -67,3 +95,245 @@ class AdministrationAuthenticationMiddleware:
             return redirect(f"{settings.LOGIN_URL}?{querystring_parameters}")
 
         return self.get_response(request)
+
+
+class QueryRecorder:
+    """
+    An execute wrapper that records the count and time of the queries of one
+    database alias, and how often each statement ran with the same parameters.
+    """
+    def __init__(self, alias: str):
+        self.alias = alias
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):  # noqa: ANN001, ANN204
+        """Runs the query and records it."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+            self.statements[(sql, repr(params))] += 1
+
+    def summary(self) -> dict:
+        """
+        Returns the recorded metrics.
+
+        Returns:
+            dict: queries, duplicate_queries (repeats of an identical statement)
+            and ms.
+        """
+        return {
+            "queries": self.count,
+            "duplicate_queries": sum(count - 1 for count in self.statements.values()),
+            "ms": round(self.seconds * 1000, 2),
+        }
+
+
+class MeasuredStream:
+    """
+    Wraps the body of a streaming response and calls `on_close` exactly once,
+    when the body is exhausted or the response is closed. Django closes the
+    response, and with it this iterator, even when the server never started
+    sending the body, which a generator's `finally` would not cover.
+    """
+    def __init__(self, content, on_close):  # noqa: ANN001
+        self._iterator = iter(content)
+        self._on_close = on_close
+
+    def __iter__(self):  # noqa: ANN204
+        return self
+
+    def __next__(self):  # noqa: ANN204
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Runs `on_close` unless it already ran."""
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            on_close()
+
+
+class PerformanceMiddleware:
+    """
+    Records the wall time, query count, duplicate query count and query time per
+    database alias of each request. The metrics are logged as JSON on the
+    "performance" logger.
+
+    Streaming responses (e.g. the white label CSV export) run their queries
+    while the body is sent, so they are measured until the body is consumed or
+    the response is closed, and logged with "streaming": true. Async streaming bodies are consumed outside
+    this thread's connections and are logged as "unmeasured" instead.
+
+    Requests over budget are logged as warnings. Budgets are configured with the
+    `PERFORMANCE_BUDGETS` setting, e.g.:
+        {
+            "default": {"wall_ms": 2000, "queries": 100, "duplicate_queries": 20},
+            "LoadPublisherCampaigns": {"queries": 10},
+        }
+    where view entries override the default per metric.
+
+    Set `PERFORMANCE_SERVER_TIMING` to True to return the metrics in a
+    `Server-Timing` header. It is off by default and only ever sent to staff
+    users, as it exposes per-database query counts and timings.
+    """
+    def __init__(self, get_response): # noqa: ANN001
+        """
+        Initialize the class on boot-up with a standard response and the budgets.
+        """
+        self.get_response = get_response
+        self.budgets = getattr(settings, "PERFORMANCE_BUDGETS", {})
+        self.server_timing_enabled = getattr(settings, "PERFORMANCE_SERVER_TIMING", False)
+
+    @staticmethod
+    def get_view_name(request: HttpRequest) -> str | None:
+        """
+        Returns the class (or function) name of the view that served the request.
+
+        Args:
+            request: The Django request object.
+        """
+        resolver_match = getattr(request, "resolver_match", None)
+        if resolver_match is None:
+            return None
+        view = getattr(resolver_match.func, "view_class", resolver_match.func)
+        return view.__name__
+
+    def get_budget(self, view_name: str | None) -> dict:
+        """
+        Returns the budget of a view, its overrides merged over the default.
+
+        Args:
+            view_name: The view class (or function) name.
+        """
+        return {
+            **DEFAULT_PERFORMANCE_BUDGET,
+            **self.budgets.get("default", {}),
+            **self.budgets.get(view_name, {}),
+        }
+
+    @staticmethod
+    def server_timing(wall_ms: float, databases: dict) -> str:
+        """
+        Builds the `Server-Timing` header value.
+
+        Args:
+            wall_ms: The request wall time.
+            databases: The summary of each database alias that was queried.
+        """
+        metrics = [f"total;dur={wall_ms}"]
+        for alias, summary in databases.items():
+            metrics.append(f'db-{alias};dur={summary["ms"]};desc="{summary["queries"]} queries"')
+        return ", ".join(metrics)
+
+    def record(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        recorders: dict,
+        started: float,
+        streaming: bool = False,
+        unmeasured: bool = False,
+    ) -> tuple:
+        """
+        Logs the metrics of a request, as a warning when it exceeded its budget.
+
+        Args:
+            request: The Django request object.
+            response: The response returned by the view.
+            recorders: The QueryRecorder of each database alias.
+            started: The perf_counter value when the request started.
+            streaming: Whether the metrics include sending a streaming body.
+            unmeasured: Whether the body of a streaming response was not measured.
+
+        Returns:
+            tuple: The wall time and the summary of each database alias that was queried.
+        """
+        wall_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        databases = {alias: recorder.summary() for alias, recorder in recorders.items() if recorder.count}
+        totals = defaultdict(int)
+        for summary in databases.values():
+            totals["queries"] += summary["queries"]
+            totals["duplicate_queries"] += summary["duplicate_queries"]
+
+        view_name = self.get_view_name(request)
+        budget = self.get_budget(view_name)
+        measured = {"wall_ms": wall_ms, **totals}
+        exceeded = sorted(
+            metric for metric, limit in budget.items()
+            if limit is not None and measured.get(metric, 0) > limit
+        )
+
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": view_name,
+            "status": response.status_code,
+            "wall_ms": wall_ms,
+            "queries": totals["queries"],
+            "duplicate_queries": totals["duplicate_queries"],
+            "databases": databases,
+            "budget_exceeded": exceeded,
+            "streaming": streaming,
+        }
+        if unmeasured:
+            record["unmeasured"] = True
+        if exceeded:
+            PERFORMANCE_LOGGER.warning(json.dumps(record), extra={"performance": record})
+        else:
+            PERFORMANCE_LOGGER.info(json.dumps(record), extra={"performance": record})
+        return wall_ms, databases
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """
+        The default (Django) middleware process that is executed during each
+        request/response cycle.
+
+        Args:
+            request: The Django request object.
+
+        Returns:
+            HttpResponse: The next middleware response.
+        """
+        recorders = {alias: QueryRecorder(alias) for alias in connections}
+        started = time.perf_counter()
+        stack = ExitStack()
+        for alias, recorder in recorders.items():
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            stack.close()
+            raise
+
+        if response.streaming:
+            if getattr(response, "is_async", False):
+                stack.close()
+                self.record(request, response, recorders, started, streaming=True, unmeasured=True)
+            else:
+                def finish() -> None:
+                    stack.close()
+                    self.record(request, response, recorders, started, streaming=True)
+
+                # The wrappers stay installed until the body has been sent or the
+                # response was closed.
+                response.streaming_content = MeasuredStream(response.streaming_content, finish)
+            # Headers go out before the body, so streaming responses get no Server-Timing.
+            return response
+
+        stack.close()
+        wall_ms, databases = self.record(request, response, recorders, started)
+
+        user = getattr(request, "user", None)
+        if self.server_timing_enabled and user is not None and user.is_staff:
+            response["Server-Timing"] = self.server_timing(wall_ms, databases)
+
+        return response
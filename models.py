@@ -58,3 +58,32 @@ class WLShareRule(models.Model):
 
     def __str__(self):
         return f"{self.owner.username} - {self.date_effective} - {self.percentage}"
+
+
+class WLDailySummary(models.Model):
+    """
+    Pre-aggregated daily white label report row per configuration, publisher and date.
+    Refreshed by `apps.whitelabel.wl_summary.refresh_wl_daily_summary`.
+    """
+    configuration = models.ForeignKey(WhiteLabelConfiguration, on_delete=models.CASCADE)
+    publisher = models.ForeignKey(User, related_name="+", on_delete=models.CASCADE)
+    date = models.DateField()
+    total_visitors = models.BigIntegerField(default=0)
+    tracked_visitors = models.BigIntegerField(default=0)
+    pub_client_rev = models.DecimalField(max_digits=16, decimal_places=4, default=0)
+    owner_rev = models.DecimalField(max_digits=16, decimal_places=4, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["configuration", "publisher", "date"],
+                name="wl_daily_summary_unique_row",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["configuration", "date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.configuration_id} - {self.publisher_id} - {self.date}"
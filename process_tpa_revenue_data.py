@@ -1,27 +1,110 @@
 """
-A management command used to process revenue data based on a ThirdPartyAccount,
-Type and date range.
+A management command used to process revenue data based on ThirdPartyAccounts,
+a ThirdPartyAccount Type and a date range.
+
+Accounts are grouped by provider: each provider task module is imported once
+and its revenue task runs once per day. Days can be processed concurrently with
+`--parallel N`, at most `--provider-concurrency` at a time per provider so a
+single revenue API is never flooded. Finished (provider, day) units are
+recorded in a checkpoint file, so an interrupted backfill skips them when it is
+run again with the same arguments.
 
 It extends the `BaseManagementCommand`.
 """
 import importlib
+import json
+import os
+import tempfile
+import threading
+import time
 import zoneinfo
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
 from django.core.management import CommandError
 from django.core.management.base import CommandParser
+from django.db import connections
 
 from apps.data.models import ThirdPartyAccount
+from apps.whitelabel.wl_summary import refresh_wl_daily_summary_task
 from core.management.commands.base import BaseManagementCommand
 
 
+class Checkpoint:
+    """
+    The units of a backfill that were processed successfully, persisted as a
+    JSON list in a file. Safe to update from several worker threads.
+    """
+
+    def __init__(self, path: str, resume: bool = True) -> None:
+        self.path = path
+        self.done = set()
+        self._lock = threading.Lock()
+        if resume and os.path.exists(path):
+            with open(path, encoding="utf8") as file:
+                self.done = set(json.load(file))
+
+    def mark(self, unit: str) -> None:
+        """Records a finished unit, e.g. "visymo:2025-01-31"."""
+        with self._lock:
+            self.done.add(unit)
+            # Write to a temporary file and rename it so an interrupted run never
+            # leaves a truncated checkpoint behind.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf8") as file:
+                json.dump(sorted(self.done), file)
+            os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Removes the checkpoint once the whole range was processed."""
+        with self._lock:
+            self.done = set()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+def get_provider_name(account_type: ThirdPartyAccount.Type) -> str:
+    """
+    Returns the provider name of an account type, used to find its task module.
+
+    Args:
+        account_type (ThirdPartyAccount.Type): The account type.
+
+    Return:
+        str: e.g. "visymo".
+    """
+    provider_name = account_type.name.lower()
+    # Special case for OBMedia RSOC.
+    if provider_name == "obmedia_rsoc":
+        provider_name = "obmedia"
+    return provider_name
+
+
+def load_revenue_task(provider_name: str) -> tuple:
+    """
+    Imports the revenue task of a provider.
+
+    Args:
+        provider_name (str): e.g. "visymo".
+
+    Return:
+        tuple: The task name and function, e.g. process_visymo_revenue_date.
+    """
+    # This will convert the provider name to the task module name.
+    # I.E - api_visymo.tasks.
+    task_module = importlib.import_module(f"api_{provider_name}.tasks")
+    task_name = f"process_{provider_name}_revenue_date"
+    return task_name, getattr(task_module, task_name)
+
+
 class Command(BaseManagementCommand):
     """
     This updates the `BaseDate` table in the database.
     """
     help = (
-        "Process revenue data for a specific date range and ThirdPartyAccount "
-        "or ThirdPartyAccount email"
+        "Process revenue data for a specific date range and ThirdPartyAccounts "
+        "or a ThirdPartyAccount Type"
     )
 
     def add_arguments(self, parser: CommandParser) -> None:
@@ -42,13 +125,69 @@ class Command(BaseManagementCommand):
             required=True,
             help="End date in YYYY-MM-DD format",
         )
-        parser.add_argument(
+        accounts = parser.add_mutually_exclusive_group(required=True)
+        accounts.add_argument(
             "-t", "--tpa_id",
             type=str,
-            required=True,
-            help="ThirdPartyAccount ID",
+            nargs="+",
+            help="One or more ThirdPartyAccount IDs",
+        )
+        accounts.add_argument(
+            "--provider",
+            type=str,
+            help="ThirdPartyAccount Type name, e.g. visymo, to process every account of",
+        )
+        parser.add_argument(
+            "-p", "--parallel",
+            type=int,
+            default=1,
+            help="Number of days processed concurrently",
+        )
+        parser.add_argument(
+            "--provider-concurrency",
+            type=int,
+            default=2,
+            help="Maximum number of days processed concurrently for one provider",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            default=None,
+            help="Checkpoint file path, defaults to one per provider set and date range in the temp directory",
+        )
+        parser.add_argument(
+            "--no-resume",
+            action="store_true",
+            help="Ignore an existing checkpoint and process every day again",
         )
 
+    def get_accounts(self, options: dict) -> list:
+        """
+        Returns the ThirdPartyAccounts selected by `--tpa_id` or `--provider`.
+
+        Raises:
+            CommandError: An unknown ID or Type.
+        """
+        if options["provider"]:
+            try:
+                account_type = ThirdPartyAccount.Type[options["provider"].upper()]
+            except KeyError as err:
+                error_msg = f"ThirdPartyAccount Type {options['provider']} does not exist."
+                raise CommandError(error_msg) from err
+            accounts = list(ThirdPartyAccount.objects.filter(type=account_type))
+            if not accounts:
+                error_msg = f"No ThirdPartyAccount of Type {account_type.name} exists."
+                raise CommandError(error_msg)
+            return accounts
+
+        tpa_ids = {tpa_id for value in options["tpa_id"] for tpa_id in value.split(",") if tpa_id}
+        accounts = list(ThirdPartyAccount.objects.filter(id__in=tpa_ids))
+        missing = tpa_ids - {str(account.id) for account in accounts}
+        if missing:
+            error_msg = f"ThirdPartyAccount with ID {', '.join(sorted(missing))} does not exist."
+            raise CommandError(error_msg)
+        return accounts
+
     def handle(self, **options: str) -> None:
         """Handle the command execution.
 
@@ -71,55 +210,87 @@ class Command(BaseManagementCommand):
                 "%Y-%m-%d"
             ).replace(tzinfo=tz)
 
-            tpa_id = options["tpa_id"]
+            parallel = max(int(options["parallel"]), 1)
+            provider_concurrency = max(int(options["provider_concurrency"]), 1)
 
-            try:
-                third_party_account = ThirdPartyAccount.objects.get(id=tpa_id)
-            except ThirdPartyAccount.DoesNotExist as err:
-                error_msg = f"ThirdPartyAccount with ID {tpa_id} does not exist."
-                raise CommandError(error_msg) from err
+            # Group the accounts by provider. The revenue tasks take only a date
+            # and process every account of their provider, so each provider runs
+            # once per day however many of its accounts were selected.
+            providers = defaultdict(list)
+            for account in self.get_accounts(options):
+                account_type = ThirdPartyAccount.Type(account.type)
+                providers[get_provider_name(account_type)].append(account.id)
 
-            # Get the ThirdPartyAccount Type.
-            third_party_account_type = ThirdPartyAccount.Type(third_party_account.type)
-            # Get the Provider Name.
-            provider_name = third_party_account_type.name.lower()
+            # Import each provider task module once.
+            tasks = {}
+            for provider_name in sorted(providers):
+                try:
+                    tasks[provider_name] = load_revenue_task(provider_name)
+                except (ImportError, AttributeError) as ex:
+                    error_msg = "Could not find revenue processing task for %s: %s"
+                    raise CommandError(
+                        error_msg,
+                        provider_name,
+                        ex,
+                    ) from ex
 
-            # Dynamically import the task module for the provider.
-            try:
-                # Special case for OBMedia RSOC.
-                if provider_name == "obmedia_rsoc":
-                    provider_name = "obmedia"
-                # This will convert the provider name to the task module name.
-                # I.E - api_visymo.tasks.
-                module_name = f"api_{provider_name}.tasks"
-                task_module = importlib.import_module(module_name)
-
-                # This will get the task e.g. process_visymo_revenue_date.
-                task_name = f"process_{provider_name}_revenue_date"
-                task_function = getattr(task_module, task_name)
-
-                # Iterate through dates and call the task function.
-                date_counter = start_date
-                while date_counter <= end_date:
-                    # Convert datetime to string format for the task.
-                    reporting_date = date_counter.strftime("%Y-%m-%d")
-                    self.logger.info(
-                        "Processing %s for %s on %s",
-                        task_name,
-                        third_party_account_type.name,
-                        reporting_date,
-                    )
-                    # Run the task with string date.
-                    task_function(reporting_date)
-                    date_counter += timedelta(days=1)
+            checkpoint = Checkpoint(
+                options["checkpoint"] or os.path.join(
+                    tempfile.gettempdir(),
+                    f"process_tpa_revenue_data_{'-'.join(tasks)}"
+                    f"_{options['start_date']}_{options['end_date']}.json",
+                ),
+                resume=not options["no_resume"],
+            )
+
+            # Convert datetimes to the string format of the task.
+            reporting_dates = []
+            date_counter = start_date
+            while date_counter <= end_date:
+                reporting_dates.append(date_counter.strftime("%Y-%m-%d"))
+                date_counter += timedelta(days=1)
 
-            except (ImportError, AttributeError) as ex:
-                error_msg = "Could not find revenue processing task for %s: %s"
-                raise CommandError(
-                    error_msg,
-                    third_party_account_type.name,
-                    ex,
-                ) from ex
+            # Interleave providers so a pool slot is rarely waiting on a busy provider.
+            units = [
+                (provider_name, reporting_date)
+                for reporting_date in reporting_dates
+                for provider_name in tasks
+                if f"{provider_name}:{reporting_date}" not in checkpoint.done
+            ]
+            skipped = len(reporting_dates) * len(tasks) - len(units)
+            if skipped:
+                self.logger.info("Resuming from %s, skipping %s processed units", checkpoint.path, skipped)
+
+            timings = self.process_units(tasks, units, parallel, provider_concurrency, checkpoint)
+            processed_dates = sorted({
+                reporting_date
+                for provider_timings in timings.values()
+                for reporting_date, timing in provider_timings.items()
+                if timing["status"]
+            })
+            failed_units = [
+                f"{provider_name}:{reporting_date}"
+                for provider_name, provider_timings in timings.items()
+                for reporting_date, timing in provider_timings.items()
+                if not timing["status"]
+            ]
+
+            if processed_dates:
+                # Tasks called directly bypass the Celery signal, so refresh the
+                # white label summary for the reprocessed dates explicitly.
+                refresh_wl_daily_summary_task.delay(processed_dates)
+
+            self.write_timing_summary(timings)
+            self.result["accounts"] = dict(providers)
+            self.result["timings"] = timings
+            self.result["skipped_units"] = skipped
+            if failed_units:
+                self.result["status"] = False
+                self.result["message"] = (
+                    f"Failed units: {', '.join(failed_units)}. Run the command again to retry them."
+                )
+            else:
+                checkpoint.clear()
 
         except (CommandError, ImportError, AttributeError):
             raise
@@ -128,3 +299,88 @@ class Command(BaseManagementCommand):
 
         self.logger_end()
         self.result_output()
+
+    def process_units(
+        self,
+        tasks: dict,
+        units: list,
+        parallel: int,
+        provider_concurrency: int,
+        checkpoint: Checkpoint,
+    ) -> dict:
+        """
+        Runs the revenue task of each (provider, day) unit, `parallel` units at a
+        time and at most `provider_concurrency` at a time for one provider.
+
+        A failed unit is logged and left out of the checkpoint; the other units
+        keep running.
+
+        Return:
+            dict: Per provider and day seconds and status.
+        """
+        timings = defaultdict(dict)
+        provider_slots = {
+            provider_name: threading.BoundedSemaphore(provider_concurrency)
+            for provider_name in tasks
+        }
+
+        def run(provider_name: str, reporting_date: str, close_connections: bool = False) -> float:
+            task_name, task_function = tasks[provider_name]
+            with provider_slots[provider_name]:
+                self.logger.info(
+                    "Processing %s for %s on %s",
+                    task_name,
+                    provider_name,
+                    reporting_date,
+                )
+                started = time.monotonic()
+                try:
+                    task_function(reporting_date)
+                finally:
+                    # Worker threads open their own DB connections.
+                    if close_connections:
+                        connections.close_all()
+                return time.monotonic() - started
+
+        def record(provider_name: str, reporting_date: str, result) -> None:  # noqa: ANN001
+            try:
+                seconds = result()
+            except Exception as ex:  # noqa: BLE001
+                self.logger.exception("%s failed for %s", provider_name, reporting_date)
+                timings[provider_name][reporting_date] = {"seconds": None, "status": False, "error": str(ex)}
+            else:
+                checkpoint.mark(f"{provider_name}:{reporting_date}")
+                timings[provider_name][reporting_date] = {"seconds": round(seconds, 2), "status": True}
+
+        if parallel <= 1:
+            for provider_name, reporting_date in units:
+                record(provider_name, reporting_date, lambda u=(provider_name, reporting_date): run(*u))
+        else:
+            with ThreadPoolExecutor(max_workers=parallel) as executor:
+                futures = {
+                    executor.submit(run, provider_name, reporting_date, True): (provider_name, reporting_date)
+                    for provider_name, reporting_date in units
+                }
+                for future in as_completed(futures):
+                    record(*futures[future], future.result)
+
+        return {
+            provider_name: dict(sorted(provider_timings.items()))
+            for provider_name, provider_timings in sorted(timings.items())
+        }
+
+    def write_timing_summary(self, timings: dict) -> None:
+        """Writes one line per processed unit with its duration and status."""
+        count = 0
+        total = 0
+        for provider_name, provider_timings in timings.items():
+            for reporting_date, timing in provider_timings.items():
+                count += 1
+                total += timing["seconds"] or 0
+                if timing["status"]:
+                    self.stdout.write(f"{provider_name:<20} {reporting_date}  {timing['seconds']:>8.2f}s  ok")
+                else:
+                    self.stdout.write(self.style.ERROR(
+                        f"{provider_name:<20} {reporting_date}  {'-':>8}   failed: {timing['error']}"
+                    ))
+        self.stdout.write(f"{count} units, {total:.2f}s of task time")
@@ -0,0 +1,133 @@
+"""
+Indexed publisher to domain associations for sponsored links.
+
+`RevenueDomains` and `RoutingDomains` store their publishers in the
+`crossroads_user_ids` text column (e.g. "[12,345]"), which can only be searched
+with regex / LIKE scans. `PublisherRevenueDomain` and `PublisherRoutingDomain`
+mirror that column as one indexed row per (publisher, domain). They live in the
+default database, so lookups resolve domain IDs here and then fetch the domains
+by primary key.
+
+`sync_publisher_domains` rebuilds the associations from the text column and runs
+on the Celery beat schedule every 10 minutes, so changes made outside this
+system can take up to one sync interval to show up. `link_revenue_domain`
+records changes made from this system right away. The tables are populated
+initially by the `sync_publisher_domains` management command during deploy.
+"""
+import json
+import logging
+from collections import defaultdict
+
+from celery import shared_task
+
+from django.db import transaction
+
+from apps.data.trafficguard.models import RevenueDomains, RoutingDomains
+from apps.sponsored_links.models import PublisherRevenueDomain, PublisherRoutingDomain
+
+LOGGER = logging.getLogger(__name__)
+
+
+def parse_user_ids(crossroads_user_ids: str | None) -> set:
+    """
+    Parses a `crossroads_user_ids` column value.
+
+    Args:
+        crossroads_user_ids (str): e.g. "[12,345]".
+
+    Return:
+        set: publisher IDs.
+    """
+    if not crossroads_user_ids:
+        return set()
+    try:
+        return {int(user_id) for user_id in json.loads(crossroads_user_ids)}
+    except (TypeError, ValueError):
+        LOGGER.warning("Unparsable crossroads_user_ids: %s", crossroads_user_ids)
+        return set()
+
+
+def get_revenue_domain_ids(publisher_id: int) -> list:
+    """Returns the IDs of the revenue domains of a publisher."""
+    return list(
+        PublisherRevenueDomain.objects.filter(publisher_id=publisher_id)
+        .values_list("revenue_domain_id", flat=True)
+    )
+
+
+def get_routing_domain_ids(publisher_id: int) -> list:
+    """Returns the IDs of the routing domains of a publisher."""
+    return list(
+        PublisherRoutingDomain.objects.filter(publisher_id=publisher_id)
+        .values_list("routing_domain_id", flat=True)
+    )
+
+
+def link_revenue_domain(publisher_id: int, revenue_domain_id: int) -> None:
+    """Records a publisher on a revenue domain, ahead of the next sync."""
+    PublisherRevenueDomain.objects.get_or_create(
+        publisher_id=publisher_id, revenue_domain_id=revenue_domain_id
+    )
+
+
+def _sync(association, domain_field: str, domains) -> tuple:
+    """
+    Makes the association table match the `crossroads_user_ids` of the given domains.
+
+    Args:
+        association: PublisherRevenueDomain or PublisherRoutingDomain.
+        domain_field (str): The domain ID field of the association.
+        domains: An iterable of (domain ID, crossroads_user_ids) tuples.
+
+    Return:
+        tuple: number of associations created and deleted.
+    """
+    wanted = {
+        (publisher_id, domain_id)
+        for domain_id, user_ids in domains
+        for publisher_id in parse_user_ids(user_ids)
+    }
+    existing = set(association.objects.values_list("publisher_id", domain_field))
+
+    stale = defaultdict(list)
+    for publisher_id, domain_id in existing - wanted:
+        stale[domain_id].append(publisher_id)
+
+    with transaction.atomic():
+        association.objects.bulk_create(
+            [
+                association(publisher_id=publisher_id, **{domain_field: domain_id})
+                for publisher_id, domain_id in wanted - existing
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        for domain_id, publisher_ids in stale.items():
+            association.objects.filter(
+                **{domain_field: domain_id}, publisher_id__in=publisher_ids
+            ).delete()
+
+    return len(wanted - existing), len(existing - wanted)
+
+
+@shared_task
+def sync_publisher_domains() -> dict:
+    """
+    Rebuilds the publisher to revenue and routing domain associations from the
+    `crossroads_user_ids` text columns.
+
+    Return:
+        dict: created and deleted counts per association.
+    """
+    revenue = _sync(
+        PublisherRevenueDomain,
+        "revenue_domain_id",
+        RevenueDomains.objects.values_list("id", "crossroads_user_ids").iterator(),
+    )
+    routing = _sync(
+        PublisherRoutingDomain,
+        "routing_domain_id",
+        RoutingDomains.objects.values_list("id", "crossroads_user_ids").iterator(),
+    )
+    LOGGER.info("Synced publisher domains, revenue %s, routing %s", revenue, routing)
+    return {"revenue": revenue, "routing": routing}
@@ -0,0 +1,66 @@
+"""
+A short-lived cache of the `LoadPublishers` index, one entry per permission scope.
+
+Entries are keyed on the query filters of the requesting user and a version
+that is bumped whenever a sponsored links campaign or site is saved or deleted,
+so counts never lag behind a change made in this system. The signal handlers
+are connected by `SponsoredLinksConfig.ready`, so writes from Celery workers and
+management commands bump the version too.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+from apps.sponsored_links_reporting.models import Site, TrafficGuardCampaign
+
+VERSION_KEY = "sl:publisher-index:version"
+
+
+def get_cache_key(filters: dict) -> str:
+    """
+    Builds the cache key of a permission scope.
+
+    Args:
+        filters (dict): The User filters of the scope, values must be JSON serializable.
+
+    Return:
+        String
+    """
+    scope = hashlib.md5(  # noqa: S324
+        json.dumps(filters, sort_keys=True, default=list).encode("utf-8")
+    ).hexdigest()
+    return f"sl:publisher-index:{cache.get(VERSION_KEY, 0)}:{scope}"
+
+
+def get_or_set(filters: dict, load: callable) -> list:
+    """
+    Returns the cached publisher index of a scope, loading and caching it on a miss.
+
+    Args:
+        filters (dict): The User filters of the scope.
+        load (callable): Loads the publisher index when it is not cached.
+
+    Return:
+        List
+    """
+    return cache.get_or_set(
+        get_cache_key(filters),
+        load,
+        timeout=getattr(settings, "PUBLISHER_INDEX_CACHE_TTL", 60),
+    )
+
+
+def invalidate(**kwargs) -> None:  # noqa: ARG001
+    """Invalidates every cached publisher index."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, timeout=None)
+
+
+for model in (TrafficGuardCampaign, Site):
+    post_save.connect(invalidate, sender=model, dispatch_uid=f"publisher_index_{model.__name__}_saved")
+    post_delete.connect(invalidate, sender=model, dispatch_uid=f"publisher_index_{model.__name__}_deleted")
@@ -3,6 +3,88 @@
 Django database router classes to control all database operations for the various
 databases or applications.
 """
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import DatabaseError, connections
+
+# Logical databases written to during the current request; their reads stay on the primary.
+_written_databases: ContextVar[frozenset] = ContextVar("written_databases", default=frozenset())
+
+
+def reset_replica_stickiness(**kwargs) -> None:
+    """
+    Forget the databases written to by the previous request handled in this context.
+    """
+    _written_databases.set(frozenset())
+
+
+request_started.connect(reset_replica_stickiness)
+
+
+class ReplicaPool:
+    """
+    A weighted pool of read replicas for one logical database.
+
+    Replicas that fail a connection health check are ejected for `eject_seconds`,
+    and the primary is used when no replica is healthy.
+    """
+
+    def __init__(
+        self,
+        primary: str,
+        replicas: dict,
+        check_interval: float = 30,
+        eject_seconds: float = 60,
+    ) -> None:
+        self.primary = primary
+        self.replicas = dict(replicas)
+        self.check_interval = check_interval
+        self.eject_seconds = eject_seconds
+        self._checked_at = {}
+        self._ejected_until = {}
+        self._lock = threading.Lock()
+
+    def eject(self, alias: str) -> None:
+        """
+        Take a replica out of rotation for `eject_seconds`.
+        """
+        with self._lock:
+            self._ejected_until[alias] = time.monotonic() + self.eject_seconds
+
+    def is_healthy(self, alias: str) -> bool:
+        """
+        Return whether a replica can serve reads, re-checking its connection at
+        most once per `check_interval`.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._ejected_until.get(alias, 0) > now:
+                return False
+            if now - self._checked_at.get(alias, float("-inf")) < self.check_interval:
+                return True
+            self._checked_at[alias] = now
+
+        try:
+            connections[alias].ensure_connection()
+        except DatabaseError:
+            self.eject(alias)
+            return False
+        return True
+
+    def choose(self) -> str:
+        """
+        Pick a healthy replica by weight, or the primary if none is healthy.
+        """
+        healthy = [alias for alias in self.replicas if self.is_healthy(alias)]
+        if not healthy:
+            return self.primary
+        weights = [self.replicas[alias] for alias in healthy]
+        return random.choices(healthy, weights=weights)[0]  # noqa: S311
 
 
 class SnowflakeDatabaseRouter:
@@ -59,26 +141,79 @@ class DefaultDatabaseRouter:
     A database router to control all database operations for the various databases
     or applications.
 
+    Models are routed by the `DATABASE_ROUTES` setting, an ordered mapping of app
+    labels or module prefixes to database aliases, falling back to `default_routes`.
+    The database of each model class is resolved once and cached, since the router
+    runs on every queryset evaluation.
+
+    Reads can be spread over the replicas listed in the `DATABASE_READ_REPLICAS`
+    setting, a mapping of logical database aliases to `{replica alias: weight}`.
+    Reads go to the primary inside transactions and, for the rest of the request,
+    after the request has written to that database.
+
     References:
     - https://docs.djangoproject.com/en/dev/topics/db/multi-db/
     """
     database = "default"
+    default_routes = {
+        "apps.data.trafficguard.models": "traffic_guard_reader",
+        "apps.dwh.models": "redshift",
+    }
 
-    def db_for_read(self, model, **hints) -> str:
-        str_model = str(model).split("\'")[1]
-        if "apps.data.trafficguard.models" in str_model:
-            return "traffic_guard_reader"
-        if "apps.dwh.models" in str_model:
-            return "redshift"
+    def __init__(self) -> None:
+        self.routes = dict(getattr(settings, "DATABASE_ROUTES", self.default_routes))
+        self._model_databases = {}
+        self.replica_pools = {
+            primary: ReplicaPool(
+                primary,
+                replicas if isinstance(replicas, dict) else dict.fromkeys(replicas, 1),
+                check_interval=getattr(settings, "DATABASE_REPLICA_CHECK_INTERVAL", 30),
+                eject_seconds=getattr(settings, "DATABASE_REPLICA_EJECT_SECONDS", 60),
+            )
+            for primary, replicas in getattr(settings, "DATABASE_READ_REPLICAS", {}).items()
+            if replicas
+        }
+
+    def resolve_database(self, model) -> str:
+        """
+        Resolve the database alias of a model class from the configured routes.
+        """
+        # noinspection PyProtectedMember
+        app_label = model._meta.app_label # noqa: SLF001
+        module = model.__module__
+        for route, alias in self.routes.items():
+            if route in (app_label, module) or module.startswith(f"{route}."):
+                return alias
         return self.database
 
+    def get_database(self, model) -> str:
+        """
+        Return the cached database alias of a model class, resolving it on first use.
+        """
+        try:
+            return self._model_databases[model]
+        except KeyError:
+            database = self._model_databases[model] = self.resolve_database(model)
+            return database
+
+    def db_for_read(self, model, **hints) -> str:
+        database = self.get_database(model)
+        pool = self.replica_pools.get(database)
+        if (
+            pool is None
+            or database in _written_databases.get()
+            or connections[database].in_atomic_block
+        ):
+            return database
+        return pool.choose()
+
     def db_for_write(self, model, **hints) -> str:
-        str_model = str(model).split("\'")[1]
-        if "apps.data.trafficguard.models" in str_model:
-            return "traffic_guard_reader"
-        if "apps.dwh.models" in str_model:
-            return "redshift"
-        return self.database
+        database = self.get_database(model)
+        if database in self.replica_pools:
+            written = _written_databases.get()
+            if database not in written:
+                _written_databases.set(written | {database})
+        return database
 
     def allow_relation(self, obj1, obj2, **hints) -> bool:
         return True
@@ -0,0 +1,31 @@
+from apps.sponsored_links.typeahead import TypeaheadSearchView
+from apps.sponsored_links_reporting.models import KeywordNew, TrafficGuardCampaign
+
+
+class SearchKeywords(TypeaheadSearchView):
+    """
+    Searches keywords, optionally restricted to the categories of a campaign
+    (campaign_id) or to one category (category_id).
+
+    Return:
+        JsonResponse: Paginated keywords.
+    """
+    search_field = "keyword"
+
+    def get_queryset(self, request):
+        keywords = KeywordNew.objects.all()
+
+        campaign_id = request.GET.get("campaign_id")
+        if campaign_id:
+            keywords = keywords.filter(
+                category__in=TrafficGuardCampaign.objects.filter(id=campaign_id).values("categories")
+            )
+
+        category_id = request.GET.get("category_id")
+        if category_id:
+            keywords = keywords.filter(category_id=category_id)
+
+        return keywords.values("id", "keyword")
+
+    def serialize(self, row):
+        return {"id": row["id"], "keyword": row["keyword"]}
@@ -0,0 +1,19 @@
+from django.contrib.auth.models import User
+
+from apps.sponsored_links.typeahead import TypeaheadSearchView
+
+
+class SearchOwners(TypeaheadSearchView):
+    """
+    Searches users by username for the owner dropdowns.
+
+    Return:
+        JsonResponse: Paginated users in select input format.
+    """
+    search_field = "username"
+
+    def get_queryset(self, request):
+        return User.objects.values("id", "username")
+
+    def serialize(self, row):
+        return {"name": row["username"], "value": row["id"]}
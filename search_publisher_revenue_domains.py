@@ -0,0 +1,25 @@
+from apps.data.trafficguard.models import RevenueDomains
+from apps.sponsored_links.publisher_domains import get_revenue_domain_ids
+from apps.sponsored_links.typeahead import TypeaheadSearchView
+
+
+class SearchPublisherRevenueDomains(TypeaheadSearchView):
+    """
+    Searches the revenue domains that belong to a publisher.
+
+    Args:
+        user_id(int): Publisher ID.
+
+    Return:
+        JsonResponse: Paginated revenue domains.
+    """
+    search_field = "name"
+
+    def get_queryset(self, request, user_id):
+        return RevenueDomains.objects.filter(
+            id__in=get_revenue_domain_ids(user_id),
+            is_deleted=False,
+        ).values("name", "revenue_provider_id", "id")
+
+    def serialize(self, row):
+        return {"name": row["name"], "revenue_provider_id": row["revenue_provider_id"], "id": row["id"]}
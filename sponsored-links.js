@@ -1,5 +1,29 @@
 import axios from 'axios'
 
+const CREATE_AD_POLL_INTERVAL = 2000
+// Give up after 10 minutes, the server reports stale jobs as well.
+const CREATE_AD_POLL_MAX_ATTEMPTS = 300
+
+const pollCreateAdProgress = (jobId, success, failure, progress, attempt = 1) => axios.get(
+    `/admin/sponsored-links/create-ad/${jobId}/progress/`
+).then(response => {
+    if (response.data.status) {
+        success(response)
+        return
+    }
+    if (progress) {
+        progress(response.data)
+    }
+    if (attempt >= CREATE_AD_POLL_MAX_ATTEMPTS) {
+        failure(new Error(`Timed out waiting for ad creation job ${jobId}`))
+        return
+    }
+    setTimeout(
+        () => pollCreateAdProgress(jobId, success, failure, progress, attempt + 1),
+        CREATE_AD_POLL_INTERVAL
+    )
+}).catch(failure)
+
 export default {
     loadCategory: (payload, success, failure) => axios.get(
         '/admin/trafficguard/sponsored-links/wizard/category/',
@@ -46,6 +70,16 @@ export default {
         `/admin/sponsored-links/publisher/${publisherId}/load-revenue-domains/`
     ).then(success).catch(failure),
 
+    searchPublisherRevenueDomains: (publisherId, payload, success, failure) => axios.get(
+        `/admin/sponsored-links/publisher/${publisherId}/search-revenue-domains/`, {
+            params: {
+                q: payload.q,
+                page: payload.page,
+                limit: payload.limit
+            }
+        }
+    ).then(success).catch(failure),
+
     loadCampaign: (payload, success, failure) => axios.get(
         `/admin/sponsored-links/campaigns/${payload}/load/`
     ).then(success).catch(failure),
@@ -104,6 +138,16 @@ export default {
         `/admin/sponsored-links/load-owners/`
     ).then(success).catch(failure),
 
+    searchOwners: (payload, success, failure) => axios.get(
+        '/admin/sponsored-links/search-owners/', {
+            params: {
+                q: payload.q,
+                page: payload.page,
+                limit: payload.limit
+            }
+        }
+    ).then(success).catch(failure),
+
     updateTemplate: (payload, success, failure) => axios.put(
         '/admin/sponsored-links/update-template/', 
         payload
@@ -205,6 +249,18 @@ export default {
         &all_keywords_for_category=${payload.all_keywords_for_category}`
     ).then(success).catch(failure),
 
+    searchKeywords: (payload, success, failure) => axios.get(
+        '/admin/sponsored-links/search-keywords/', {
+            params: {
+                q: payload.q,
+                campaign_id: payload.campaign_id,
+                category_id: payload.category_id,
+                page: payload.page,
+                limit: payload.limit
+            }
+        }
+    ).then(success).catch(failure),
+
     loadAdData: (payload, success, failure) => axios.get(
         `/admin/sponsored-links/load-ad-data/?container_id=${payload.container_id}`
     ).then(success).catch(failure),
@@ -223,9 +279,19 @@ export default {
         `/admin/sponsored-links/publishers/${payload}/routing-domains/`,
     ).then(success).catch(failure),
 
-    createAd: (payload, success, failure) => axios.post(
+    createAd: (payload, success, failure, progress) => axios.post(
         `/admin/sponsored-links/create-ad/`,
         payload
+    ).then(response => {
+        if (response.data.job_id) {
+            pollCreateAdProgress(response.data.job_id, success, failure, progress)
+        } else {
+            success(response)
+        }
+    }).catch(failure),
+
+    loadCreateAdProgress: (jobId, success, failure) => axios.get(
+        `/admin/sponsored-links/create-ad/${jobId}/progress/`
     ).then(success).catch(failure),
 
 }
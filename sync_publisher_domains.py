@@ -0,0 +1,37 @@
+"""
+A management command used to rebuild the publisher to revenue and routing
+domain associations from the `crossroads_user_ids` text columns.
+
+Run it once during the deploy that adds `PublisherRevenueDomain` and
+`PublisherRoutingDomain`, right after migrating, so the publisher domain
+dropdowns are populated before the first `sync_publisher_domains` beat run.
+Afterwards the mirror lags changes made outside this system by up to one sync
+interval (10 minutes).
+
+It extends the `BaseManagementCommand`.
+"""
+from apps.sponsored_links.publisher_domains import sync_publisher_domains
+from core.management.commands.base import BaseManagementCommand
+
+
+class Command(BaseManagementCommand):
+    """
+    This rebuilds the `PublisherRevenueDomain` and `PublisherRoutingDomain` tables.
+    """
+    help = "Sync the publisher to revenue and routing domain associations"
+
+    def handle(self, **options: str) -> None:  # noqa: ARG002
+        """Handle the command execution.
+
+        Args:
+            **options: Command line arguments
+        """
+        self.logger_start()
+
+        try:
+            self.result.update(sync_publisher_domains())
+        except Exception as ex:  # noqa: BLE001
+            self.handle_exception(ex)
+
+        self.logger_end()
+        self.result_output()
@@ -2,12 +2,12 @@ from django_tables2 import Column, tables
 
 from django.utils.safestring import mark_safe
 
-from apps.main_app.helpers import SummedColumn
-from apps.whitelabel.models import WhiteLabelConfiguration
+from apps.whitelabel.models import WhiteLabelConfiguration, WLPublisher
 
 
 TABLE_CLASS = "paleblue"
 LEFT_ALIGN = {"td": {"style": "text-align: left;"}, "th": {"style": "text-align: left;"} }
+BUCKET_NAMES = dict(WLPublisher.BUCKET_TYPES)
 
 class WhiteLabelIndexTable(tables.Table):
 
@@ -74,18 +74,31 @@ class WlShareRuleTable(tables.Table):
     def render_percentage(self, value):
         return f"{value*100:.2f}%"
 
+def total_footer(key):
+    return lambda table: f"${table.totals.get(key, 0):.2f}"
+
 class WlPublisherReportTable(tables.Table):
 
     class Meta:
         attrs = {"class": TABLE_CLASS}
+        order_by = ("username",)
 
     username = Column(attrs=LEFT_ALIGN)
     bucket = Column(attrs=LEFT_ALIGN)
     total_visitors__sum = Column(verbose_name="Gross Visitors")
     tracked_visitors__sum = Column(verbose_name="Tracked Visitors")
-    owner_rev = SummedColumn(footer_format_string="${0:.2f}", verbose_name="Partner Revenue")
-    pub_client_rev = SummedColumn(footer_format_string="${0:.2f}", verbose_name="Publisher Revenue")
-    diff = SummedColumn(footer_format_string="${0:.2f}", verbose_name="Partner Profit")
+    owner_rev = Column(footer=total_footer("owner_rev"), verbose_name="Partner Revenue")
+    pub_client_rev = Column(footer=total_footer("pub_client_rev"), verbose_name="Publisher Revenue")
+    diff = Column(footer=total_footer("diff"), verbose_name="Partner Profit")
+
+    def __init__(self, *args, totals=None, **kwargs):
+        # footer totals come from WlReportManager.get_summary_totals, not from the rows on the page
+        self.totals = totals or {}
+        super().__init__(*args, **kwargs)
+
+    @staticmethod
+    def render_bucket(value):
+        return BUCKET_NAMES.get(value, value)
 
     @staticmethod
     def render_owner_rev(value):
@@ -0,0 +1,148 @@
+"""This module contains the Celery tasks for the sponsored links app."""
+
+
+import logging
+import time
+
+from celery import shared_task
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.sponsored_links.utils import (
+    create_ad_container,
+    create_ads,
+    create_zone,
+    resolve_keyword_ids,
+)
+from apps.sponsored_links_reporting.models import Ad, TrafficGuardCampaign
+
+
+LOGGER = logging.getLogger(__name__)
+
+AD_CREATION_STAGES = ("zone", "keywords", "container", "ads")
+
+
+def _job_key(job_id: str) -> str:
+    return f"sl:create-ad-job:{job_id}"
+
+
+def record_ad_creation_job(job_id: str, user_id: int) -> None:
+    """
+    Records who queued an ad creation job and when, so its progress can only be
+    read by that user and a job that never starts can be reported as stale.
+
+    Args:
+        job_id (str): The Celery task ID.
+        user_id (int): The user who queued the job.
+    """
+    cache.set(
+        _job_key(job_id),
+        {"user_id": user_id, "queued_at": time.time()},
+        timeout=getattr(settings, "CREATE_AD_JOB_TTL", 86400),
+    )
+
+
+def get_ad_creation_job(job_id: str) -> dict | None:
+    """
+    Returns the owner record of an ad creation job, None for unknown or expired jobs.
+
+    Args:
+        job_id (str): The Celery task ID.
+    """
+    return cache.get(_job_key(job_id))
+
+
+@shared_task(bind=True)
+def finalize_ad_creation(self, data: dict) -> dict:  # noqa: ANN001
+    """
+    Creates the zone, ad container and ad iterations for a CreateAd request.
+
+    Progress is published through the task state so `LoadCreateAdProgress` can
+    report the status of each stage and the sync result of each ad while the
+    job is running.
+
+    Args:
+        data (dict): The decoded CreateAd request body.
+
+    Return:
+        dict: Final status, message, per-stage status and per-ad results.
+    """
+    progress = {
+        "stages": dict.fromkeys(AD_CREATION_STAGES, "pending"),
+        "ads": [],
+    }
+
+    def set_stage(stage: str, stage_status: str) -> None:
+        """Updates the status of a stage and publishes the progress."""
+        progress["stages"][stage] = stage_status
+        self.update_state(state="PROGRESS", meta=progress)
+
+    def record_ad(ad: Ad, error: str | None) -> None:
+        """Records the sync result of an ad and publishes the progress."""
+        progress["ads"].append({"id": ad.id, "synced": error is None, "error": error})
+        self.update_state(state="PROGRESS", meta=progress)
+
+    def fail(stage: str, ex: Exception) -> dict:
+        """Marks a stage as failed and returns the final error result."""
+        LOGGER.error("Error during %s stage of ad creation: %s", stage, ex)
+        progress["stages"][stage] = "error"
+        return {"status": "error", "message": str(ex), **progress}
+
+    zone_details = data["zoneDetails"]
+    campaign_id = data["campaignId"]
+    keywords = data["keywords"][0].split("\n")
+
+    try:
+        campaign = TrafficGuardCampaign.objects.get(id=campaign_id)
+    except TrafficGuardCampaign.DoesNotExist:
+        return {"status": "error", "message": f"No campaign found with id: {campaign_id}", **progress}
+
+    try:
+        set_stage("zone", "running")
+        zone = create_zone(
+            zone_details["name"],
+            zone_details["width"],
+            zone_details["height"],
+            zone_details["site"]
+        )
+        set_stage("zone", "done")
+    except Exception as ex:  # noqa: BLE001
+        return fail("zone", ex)
+
+    try:
+        set_stage("keywords", "running")
+        keyword_ids, missing_keywords = resolve_keyword_ids(keywords)
+        if missing_keywords:
+            LOGGER.warning("Keywords do not exist: %s", ", ".join(sorted(missing_keywords)))
+        progress["missing_keywords"] = sorted(missing_keywords)
+        set_stage("keywords", "done")
+    except Exception as ex:  # noqa: BLE001
+        return fail("keywords", ex)
+
+    try:
+        set_stage("container", "running")
+        ad_container, _ = create_ad_container(
+            name=data["name"],
+            title="Sponsored Links",
+            zone_id=zone.id,
+            template_id=int(data["template_id"]),
+            keyword_ids=keyword_ids,
+            campaign_id=campaign_id
+        )
+        set_stage("container", "done")
+    except Exception as ex:  # noqa: BLE001
+        return fail("container", ex)
+
+    try:
+        set_stage("ads", "running")
+        create_ads(ad_container, data["ad_iterations"], campaign, on_result=record_ad)
+        set_stage("ads", "done")
+    except Exception as ex:  # noqa: BLE001
+        return fail("ads", ex)
+
+    return {
+        "status": "success",
+        "message": "Ad container and ads created successfully.",
+        **progress,
+    }
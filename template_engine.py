@@ -0,0 +1,130 @@
+"""
+A small compiled renderer for sponsored links template placeholders.
+
+Templates are parsed once into literal and placeholder segments and cached by
+template id and content version, so rendering is a single pass over the
+segments instead of one `str.replace` per keyword over the whole document.
+Placeholders look like `{{links.0.keyword}}`; placeholders missing from the
+render context are left untouched, as the `str.replace` loop did.
+"""
+import re
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+from apps.sponsored_links import fileutils
+
+PLACEHOLDER = re.compile(r"\{\{([\w.]+)\}\}")
+
+
+class CompiledTemplate:
+    """
+    A template split into alternating literal and placeholder segments.
+
+    Attributes:
+        literals (list): The literal text around the placeholders, one longer than names.
+        names (list): The placeholder names, e.g. "links.0.keyword".
+    """
+
+    def __init__(self, html: str) -> None:
+        self.literals = []
+        self.names = []
+        position = 0
+        for match in PLACEHOLDER.finditer(html):
+            self.literals.append(html[position:match.start()])
+            self.names.append(match.group(1))
+            position = match.end()
+        self.literals.append(html[position:])
+
+    def render(self, context: dict) -> str:
+        """
+        Renders the template in a single pass.
+
+        Args:
+            context (dict): Placeholder names mapped to their values.
+
+        Return:
+            String
+        """
+        parts = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            value = context.get(name)
+            parts.append(f"{{{{{name}}}}}" if value is None else str(value))
+            parts.append(literal)
+        return "".join(parts)
+
+
+class CompiledTemplateCache:
+    """A thread-safe LRU cache of compiled templates keyed by (template id, version)."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compile(self, template_id: int, version: str, html: str) -> CompiledTemplate:
+        key = (template_id, version)
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                return compiled
+
+        compiled = CompiledTemplate(html)
+        with self._lock:
+            self._entries[key] = compiled
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+compiled_templates = CompiledTemplateCache(getattr(settings, "COMPILED_TEMPLATE_CACHE_SIZE", 512))
+
+
+def compile_template(template_id: int, html: str, version: str | None = None) -> CompiledTemplate:
+    """
+    Returns the compiled form of a template, compiling it on first use.
+
+    Args:
+        template_id (int): Template ID.
+        html (str): The template HTML.
+        version (str): The template content version, defaults to the content hash.
+
+    Return:
+        CompiledTemplate
+    """
+    return compiled_templates.get_or_compile(template_id, version or fileutils.content_hash(html), html)
+
+
+def keyword_context(keywords: list) -> dict:
+    """
+    Builds the `links.N.keyword` render context for a list of keyword strings.
+
+    Args:
+        keywords (list): Keyword strings in link order.
+
+    Return:
+        Dict
+    """
+    return {f"links.{idx}.keyword": keyword for idx, keyword in enumerate(keywords)}
+
+
+def render_template(template_id: int, html: str, context: dict, version: str | None = None) -> str:
+    """
+    Renders a template with the given context using the compiled template cache.
+
+    Args:
+        template_id (int): Template ID.
+        html (str): The template HTML.
+        context (dict): Placeholder names mapped to their values.
+        version (str): The template content version, defaults to the content hash.
+
+    Return:
+        String
+    """
+    return compile_template(template_id, html, version).render(context)
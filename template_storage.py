@@ -0,0 +1,176 @@
+"""
+Storage backends for sponsored links template HTML.
+
+The backend is selected with the `TEMPLATE_STORAGE_BACKEND` setting, a dotted
+path to one of the classes below (S3 by default). `LocalTemplateStorage` reads
+and writes the existing directory set by `TEMPLATE_STORAGE_ROOT`, and
+`InMemoryTemplateStorage` keeps templates in a dict for tests and offline
+benchmarks.
+"""
+import os
+import tempfile
+import threading
+import uuid
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from apps.sponsored_links import fileutils
+
+DEFAULT_BACKEND = "apps.sponsored_links.template_storage.S3TemplateStorage"
+
+
+class TemplateStorage(ABC):
+    """
+    The interface shared by every template storage backend. Paths may be full
+    template paths, e.g. "templates/123.html"; only the file name is used as key.
+    """
+
+    @abstractmethod
+    def read(self, path: str) -> str:
+        """Returns the template HTML stored at path."""
+
+    @abstractmethod
+    def write(self, path: str, html: str, new: bool = False) -> bool:
+        """
+        Stores html at path, returns False when identical content was already stored.
+        new marks a freshly generated path, which skips the comparison.
+        """
+
+    @abstractmethod
+    def delete(self, path: str) -> None:
+        """Removes the template stored at path."""
+
+    @abstractmethod
+    def copy(self, path: str) -> str:
+        """Copies the template stored at path to a new random key and returns that key."""
+
+    @abstractmethod
+    def content_hash(self, path: str) -> str | None:
+        """Returns the sha256 of the template stored at path, None if it does not exist."""
+
+    @staticmethod
+    def key(path: str) -> str:
+        return fileutils.clean_path(path)
+
+    @staticmethod
+    def new_key() -> str:
+        return uuid.uuid4().hex.upper()[0:6]
+
+
+class S3TemplateStorage(TemplateStorage):
+    """Stores templates in the `sl-templates` S3 bucket through `fileutils`."""
+
+    def read(self, path: str) -> str:
+        return fileutils.read_file(path)
+
+    def write(self, path: str, html: str, new: bool = False) -> bool:
+        return fileutils.put_file(self.key(path), html, new=new)
+
+    def delete(self, path: str) -> None:
+        fileutils.delete(path)
+
+    def copy(self, path: str) -> str:
+        return fileutils.copy_file(self.key(path))
+
+    def content_hash(self, path: str) -> str | None:
+        return fileutils.stored_content_hash(path)
+
+
+class LocalTemplateStorage(TemplateStorage):
+    """Stores templates as files in a local directory."""
+
+    def __init__(self, root: str | None = None) -> None:
+        self.root = root or getattr(settings, "TEMPLATE_STORAGE_ROOT", None)
+        if not self.root:
+            error_msg = "LocalTemplateStorage requires the TEMPLATE_STORAGE_ROOT setting."
+            raise ImproperlyConfigured(error_msg)
+        if not os.path.isdir(self.root):
+            error_msg = f"TEMPLATE_STORAGE_ROOT {self.root} is not a directory."
+            raise ImproperlyConfigured(error_msg)
+
+    def _file_path(self, path: str) -> str:
+        return os.path.join(self.root, self.key(path))
+
+    def read(self, path: str) -> str:
+        with open(self._file_path(path), encoding="utf8") as file:
+            return file.read()
+
+    def write(self, path: str, html: str, new: bool = False) -> bool:
+        if not new and self.content_hash(path) == fileutils.content_hash(html):
+            return False
+        # Write to a temporary file and rename it so readers never see a partial template.
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf8") as file:
+            file.write(html)
+        os.replace(tmp_path, self._file_path(path))
+        return True
+
+    def delete(self, path: str) -> None:
+        try:
+            os.remove(self._file_path(path))
+        except FileNotFoundError:
+            pass
+
+    def copy(self, path: str) -> str:
+        new_key = self.new_key()
+        self.write(new_key, self.read(path), new=True)
+        return new_key
+
+    def content_hash(self, path: str) -> str | None:
+        try:
+            return fileutils.content_hash(self.read(path))
+        except FileNotFoundError:
+            return None
+
+
+class InMemoryTemplateStorage(TemplateStorage):
+    """Keeps templates in memory, intended for tests and offline benchmarks."""
+
+    def __init__(self) -> None:
+        self.files = {}
+
+    def read(self, path: str) -> str:
+        return self.files[self.key(path)]
+
+    def write(self, path: str, html: str, new: bool = False) -> bool:  # noqa: ARG002
+        key = self.key(path)
+        if self.files.get(key) == html:
+            return False
+        self.files[key] = html
+        return True
+
+    def delete(self, path: str) -> None:
+        self.files.pop(self.key(path), None)
+
+    def copy(self, path: str) -> str:
+        new_key = self.new_key()
+        self.files[new_key] = self.read(path)
+        return new_key
+
+    def content_hash(self, path: str) -> str | None:
+        html = self.files.get(self.key(path))
+        return None if html is None else fileutils.content_hash(html)
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_template_storage() -> TemplateStorage:
+    """Returns the process-wide template storage configured by `TEMPLATE_STORAGE_BACKEND`."""
+    global _storage  # noqa: PLW0603
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                backend = getattr(settings, "TEMPLATE_STORAGE_BACKEND", DEFAULT_BACKEND)
+                _storage = import_string(backend)()
+    return _storage
+
+
+def set_template_storage(storage: TemplateStorage | None) -> None:
+    """Replaces the process-wide template storage, None reloads it from settings."""
+    global _storage  # noqa: PLW0603
+    _storage = storage
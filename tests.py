@@ -1,3 +1,426 @@
-from django.test import TestCase
+"""
+Query-count and latency benchmarks for the sponsored links and white label views,
+and a parity check of the vectorized white label revenue reversal.
 
-# Create your tests here.
+The suite is opt-in: it only runs with the `BENCHMARK` environment variable
+set. The fixtures seed realistic volumes (scaled with the `BENCHMARK_SCALE`
+environment variable) and every view is requested `BENCHMARK_REPEAT` times
+with a cold cache. Each test asserts a query-count ceiling and a p95 latency
+budget (scaled with `BENCHMARK_LATENCY_FACTOR` for slower machines), and all
+measurements are written as JSON to `BENCHMARK_OUTPUT` so releases can be
+compared.
+
+    BENCHMARK=1 python manage.py test apps.sponsored_links --tag benchmark
+"""
+import json
+import os
+import platform
+import statistics
+import time
+import unittest
+from contextlib import ExitStack
+from datetime import date, timedelta
+
+import django
+import pandas as pd
+from django.contrib.auth.models import Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connections
+from django.test import RequestFactory, TestCase, override_settings, tag
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.main_app.wl_rulebook import WhiteLabelRuleBookMultiPublishers
+from apps.sponsored_links.load_publisher_campaigns import LoadPublisherCampaigns
+from apps.sponsored_links.load_publishers import LoadPublishers
+from apps.sponsored_links.load_site_zones import LoadSiteZones
+from apps.sponsored_links.load_zone_ads import LoadZoneAds
+from apps.sponsored_links_reporting.models import (
+    AdContainer,
+    AdZone,
+    Category,
+    KeywordNew,
+    Site,
+    Template,
+    TrafficGuardCampaign,
+)
+from apps.whitelabel.models import WhiteLabelConfiguration, WLDailySummary, WLPublisher, WLShareRule
+from apps.whitelabel.views import LoadWhiteLabelSettings, WhiteLabelPubReport
+from apps.whitelabel.wl_reports import WlReportManager
+
+SCALE = float(os.environ.get("BENCHMARK_SCALE", 1))
+REPEAT = int(os.environ.get("BENCHMARK_REPEAT", 20))
+LATENCY_FACTOR = float(os.environ.get("BENCHMARK_LATENCY_FACTOR", 1))
+OUTPUT = os.environ.get("BENCHMARK_OUTPUT", "benchmark_results.json")
+
+VOLUMES = {
+    name: max(int(count * SCALE), 1)
+    for name, count in {
+        "publishers": 2000,
+        "sites_per_publisher": 2,
+        "zones_per_site": 2,
+        "categories": 50,
+        "keywords": 5000,
+        "keywords_per_container": 10,
+        "wl_publishers": 2000,
+        "wl_summary_days": 30,
+    }.items()
+}
+
+# Queries per request, across every database alias.
+QUERY_CEILINGS = {
+    "LoadPublishers": 2,
+    "LoadSiteZones": 1,
+    "LoadZoneAds": 2,
+    "LoadPublisherCampaigns": 6,
+    "LoadWhiteLabelSettings": 6,
+    "WhiteLabelPubReport": 10,
+}
+
+# p95 latency per request in milliseconds, multiplied by BENCHMARK_LATENCY_FACTOR.
+P95_BUDGETS_MS = {
+    "LoadPublishers": 300,
+    "LoadSiteZones": 50,
+    "LoadZoneAds": 100,
+    "LoadPublisherCampaigns": 150,
+    "LoadWhiteLabelSettings": 300,
+    "WhiteLabelPubReport": 500,
+}
+
+
+def percentile(samples: list, pct: int) -> float:
+    """Returns the pct percentile of samples."""
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+class ShareRuleReversalParity(TestCase):
+    """
+    Checks WlReportManager.apply_rules_reverse against the per-row
+    WhiteLabelRuleBookMultiPublishers.apply_rule_reverse it replaces. Its result
+    is stored in WLDailySummary, so a mismatch corrupts partner revenue rows.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.configuration = WhiteLabelConfiguration.objects.create(
+            title="Parity",
+            name="parity",
+            logo_icon="",
+            primary_color="#000000",
+            secondary_color="#ffffff",
+            text_color="#000000",
+        )
+        cls.ruled = User.objects.create(username="parity-ruled")
+        cls.unruled = User.objects.create(username="parity-unruled")
+        for publisher in (cls.ruled, cls.unruled):
+            WLPublisher.objects.create(configuration=cls.configuration, publisher=publisher)
+        WLShareRule.objects.bulk_create(
+            [
+                # Backdated before the report window.
+                WLShareRule(owner=cls.ruled, date_effective=date(2020, 1, 1), percentage=0.8),
+                WLShareRule(owner=cls.ruled, date_effective=date(2024, 1, 10), percentage=0.5),
+                # Inactive, the rule before it stays in effect.
+                WLShareRule(owner=cls.ruled, date_effective=date(2024, 1, 15), percentage=0.3, active=False),
+                WLShareRule(owner=cls.ruled, date_effective=date(2024, 1, 20), percentage=0),
+                WLShareRule(owner=cls.ruled, date_effective=date(2024, 1, 25), percentage=0.9),
+            ]
+        )
+
+    def test_matches_rulebook(self):
+        dates = [date(2019, 12, 31), *(date(2024, 1, day) for day in (1, 10, 12, 15, 17, 20, 22, 25, 31))]
+        df = pd.DataFrame(
+            [
+                {"crossroads_user_id": publisher.id, "date": day, "pub_client_rev": 100.0}
+                for publisher in (self.ruled, self.unruled)
+                for day in dates
+            ]
+        )
+        report_manager = WlReportManager(self.configuration, dates[0], dates[-1])
+        rulebook = WhiteLabelRuleBookMultiPublishers()
+
+        reversed_df = report_manager.apply_rules_reverse(df)
+        self.assertEqual(len(reversed_df), len(df))
+        for row in reversed_df.itertuples():
+            day = row.date.date()
+            with self.subTest(publisher=row.crossroads_user_id, date=day):
+                expected = rulebook.apply_rule_reverse(row.crossroads_user_id, day, row.pub_client_rev)
+                self.assertAlmostEqual(row.owner_rev, float(expected), places=4)
+
+
+@tag("benchmark")
+@unittest.skipUnless(os.environ.get("BENCHMARK"), "Set BENCHMARK=1 to run the view benchmarks.")
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class ViewBenchmarks(TestCase):
+    """Seeds the benchmark fixtures once and measures each view against them."""
+    # Only the databases the measured views query.
+    databases = {"default", "traffic_guard_reader"}
+    results = {}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("benchmark-admin", "benchmark@example.com", "benchmark")
+
+        publisher_permission, _ = Permission.objects.get_or_create(
+            codename="benchmark_publisher",
+            content_type=ContentType.objects.get_for_model(User),
+            defaults={"name": "Benchmark publisher"},
+        )
+        publishers = User.objects.bulk_create(
+            [User(username=f"publisher-{idx:05d}", is_active=True) for idx in range(VOLUMES["publishers"])],
+            batch_size=1000,
+        )
+        User.user_permissions.through.objects.bulk_create(
+            [
+                User.user_permissions.through(user_id=publisher.id, permission_id=publisher_permission.id)
+                for publisher in publishers
+            ],
+            batch_size=1000,
+        )
+
+        categories = Category.objects.bulk_create(
+            [Category(name=f"category-{idx}") for idx in range(VOLUMES["categories"])]
+        )
+        keywords = KeywordNew.objects.bulk_create(
+            [
+                KeywordNew(keyword=f"keyword {idx}", category=categories[idx % len(categories)])
+                for idx in range(VOLUMES["keywords"])
+            ],
+            batch_size=1000,
+        )
+        template = Template.objects.create(
+            name="benchmark",
+            created_by=cls.admin,
+            filename="benchmark.html",
+            path="templates/benchmark.html",
+            width=300,
+            height=250,
+            links=VOLUMES["keywords_per_container"],
+        )
+
+        campaigns = TrafficGuardCampaign.objects.bulk_create(
+            [
+                TrafficGuardCampaign(
+                    id=idx + 1,
+                    name=f"campaign-{idx:05d}",
+                    user=publisher,
+                    routing_domain=f"route-{idx}.example.com",
+                    is_deleted=False,
+                    version=TrafficGuardCampaign.VERSION_1,
+                )
+                for idx, publisher in enumerate(publishers)
+            ],
+            batch_size=1000,
+        )
+        TrafficGuardCampaign.categories.through.objects.bulk_create(
+            [
+                TrafficGuardCampaign.categories.through(
+                    trafficguardcampaign_id=campaign.id,
+                    category_id=categories[idx % len(categories)].id,
+                )
+                for idx, campaign in enumerate(campaigns)
+            ],
+            batch_size=1000,
+        )
+
+        sites = Site.objects.bulk_create(
+            [
+                Site(user=publisher, name=f"site-{publisher.id}-{idx}", deleted=False)
+                for publisher in publishers
+                for idx in range(VOLUMES["sites_per_publisher"])
+            ],
+            batch_size=1000,
+        )
+        zones = AdZone.objects.bulk_create(
+            [
+                AdZone(site=site, name=f"zone-{site.id}-{idx}", width=300, height=250, snippet_code="")
+                for site in sites
+                for idx in range(VOLUMES["zones_per_site"])
+            ],
+            batch_size=1000,
+        )
+
+        campaign_by_user = {campaign.user_id: campaign for campaign in campaigns}
+        site_user = {site.id: site.user_id for site in sites}
+        containers = AdContainer.objects.bulk_create(
+            [
+                AdContainer(
+                    name=f"container-{zone.id}",
+                    title=f"Container {zone.id}",
+                    zone=zone,
+                    template=template,
+                    tg_campaign=campaign_by_user[site_user[zone.site_id]],
+                )
+                for zone in zones
+            ],
+            batch_size=1000,
+        )
+        AdContainer.keywords.through.objects.bulk_create(
+            [
+                AdContainer.keywords.through(
+                    adcontainer_id=container.id,
+                    keywordnew_id=keywords[(idx * VOLUMES["keywords_per_container"] + offset) % len(keywords)].id,
+                )
+                for idx, container in enumerate(containers)
+                for offset in range(VOLUMES["keywords_per_container"])
+            ],
+            batch_size=1000,
+        )
+
+        cls.configuration = WhiteLabelConfiguration.objects.create(
+            title="Benchmark",
+            name="benchmark",
+            logo_icon="",
+            primary_color="#000000",
+            secondary_color="#ffffff",
+            text_color="#000000",
+        )
+        cls.configuration.admins.add(cls.admin)
+        wl_publishers = publishers[:VOLUMES["wl_publishers"]]
+        WLPublisher.objects.bulk_create(
+            [WLPublisher(configuration=cls.configuration, publisher=publisher) for publisher in wl_publishers],
+            batch_size=1000,
+        )
+        today = timezone.now().date()
+        WLDailySummary.objects.bulk_create(
+            [
+                WLDailySummary(
+                    configuration=cls.configuration,
+                    publisher=publisher,
+                    date=today - timedelta(days=day),
+                    total_visitors=1000,
+                    tracked_visitors=900,
+                    pub_client_rev=10,
+                    owner_rev=12,
+                )
+                for publisher in wl_publishers
+                for day in range(VOLUMES["wl_summary_days"])
+            ],
+            batch_size=2000,
+        )
+
+        cls.publisher = publishers[0]
+        cls.site = sites[0]
+        cls.zone = zones[0]
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if cls.results:
+            with open(OUTPUT, "w", encoding="utf8") as file:
+                json.dump(
+                    {
+                        "created": timezone.now().isoformat(),
+                        "python": platform.python_version(),
+                        "django": django.get_version(),
+                        "volumes": VOLUMES,
+                        "repeat": REPEAT,
+                        "views": cls.results,
+                    },
+                    file,
+                    indent=2,
+                    sort_keys=True,
+                )
+
+    def measure(self, name: str, view, path: str, **kwargs) -> dict:  # noqa: ANN001
+        """
+        Requests a view REPEAT times with a cold cache and records its query
+        count per database alias and latency percentiles.
+
+        Args:
+            name: The benchmark name, a key of QUERY_CEILINGS and P95_BUDGETS_MS.
+            view: The view function.
+            path: The request path, including the query string.
+            **kwargs: The URL keyword arguments of the view.
+
+        Returns:
+            dict: The measurements.
+        """
+        factory = RequestFactory()
+        samples = []
+        queries = {}
+        for _ in range(REPEAT):
+            # The local memory cache configured above, not a shared backend.
+            cache.clear()
+            request = factory.get(path)
+            request.user = self.admin
+            with ExitStack() as stack:
+                captures = {
+                    alias: stack.enter_context(CaptureQueriesContext(connections[alias]))
+                    for alias in sorted(self.databases)
+                }
+                started = time.perf_counter()
+                response = view(request, **kwargs)
+                if hasattr(response, "render"):
+                    response.render()
+                elapsed = (time.perf_counter() - started) * 1000
+            self.assertEqual(response.status_code, 200)
+            samples.append(elapsed)
+            queries = {alias: len(capture) for alias, capture in captures.items() if len(capture)}
+
+        result = {
+            "queries": sum(queries.values()),
+            "queries_per_database": queries,
+            "p50_ms": round(percentile(samples, 50), 2),
+            "p95_ms": round(percentile(samples, 95), 2),
+            "max_ms": round(max(samples), 2),
+        }
+        self.results[name] = result
+
+        self.assertLessEqual(
+            result["queries"], QUERY_CEILINGS[name], f"{name} ran {queries} queries"
+        )
+        self.assertLessEqual(
+            result["p95_ms"],
+            P95_BUDGETS_MS[name] * LATENCY_FACTOR,
+            f"{name} p95 latency {result['p95_ms']}ms",
+        )
+        return result
+
+    def test_load_publishers(self):
+        self.measure("LoadPublishers", LoadPublishers.as_view(), "/load-publishers/")
+
+    def test_load_site_zones(self):
+        self.measure(
+            "LoadSiteZones",
+            LoadSiteZones.as_view(),
+            "/load-zones/",
+            user_id=self.publisher.id,
+            site_id=self.site.id,
+        )
+
+    def test_load_zone_ads(self):
+        self.measure(
+            "LoadZoneAds",
+            LoadZoneAds.as_view(),
+            "/load-ads/",
+            user_id=self.publisher.id,
+            site_id=self.site.id,
+            zone_id=self.zone.id,
+        )
+
+    def test_load_publisher_campaigns(self):
+        self.measure(
+            "LoadPublisherCampaigns",
+            LoadPublisherCampaigns.as_view(),
+            "/load-campaigns/",
+            user_id=self.publisher.id,
+        )
+
+    def test_load_white_label_settings(self):
+        self.measure(
+            "LoadWhiteLabelSettings",
+            LoadWhiteLabelSettings.as_view(),
+            "/load-settings/",
+            white_label_id=self.configuration.id,
+        )
+
+    def test_white_label_pub_report(self):
+        self.measure(
+            "WhiteLabelPubReport",
+            WhiteLabelPubReport.as_view(),
+            "/pub-report/",
+            wl_id=self.configuration.id,
+        )
@@ -0,0 +1,110 @@
+"""
+Shared paginated prefix / trigram search used by the sponsored links typeahead
+endpoints.
+
+Matches on a prefix of the search field come first, followed by trigram
+matches ranked by similarity. Both filters are applied to `UPPER(field)`, the
+expression indexed with `gin (UPPER(field) gin_trgm_ops)` by the
+`create_search_indexes` management command, so the index serves the prefix
+`LIKE` and the trigram `%` match alike.
+
+The `trigram_similar` lookup is only registered when `django.contrib.postgres`
+is in `INSTALLED_APPS`; without it every search of three or more characters
+raises `FieldError`.
+"""
+from abc import ABC, abstractmethod
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import Case, IntegerField, Q, QuerySet, Value, When
+from django.db.models.functions import Upper
+from django.http import JsonResponse
+from django.views import View
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+# pg_trgm needs at least three characters to produce a useful trigram match.
+MIN_TRIGRAM_LENGTH = 3
+
+
+def search(queryset: QuerySet, field: str, term: str, limit: int, offset: int) -> tuple:
+    """
+    Searches a queryset on one text field.
+
+    Args:
+        queryset (QuerySet): The rows the search is restricted to.
+        field (str): The text field to search.
+        term (str): The search term.
+        limit (int): Maximum number of results.
+        offset (int): Number of results to skip.
+
+    Return:
+        tuple: The matching rows and whether more results exist.
+    """
+    term = term.upper()
+    # Case sensitive lookups on the annotation compile to UPPER(field) LIKE 'TERM%'
+    # and UPPER(field) % 'TERM', matching the indexed expression.
+    queryset = queryset.annotate(search_value=Upper(field))
+    prefix = Q(search_value__startswith=term)
+    if len(term) >= MIN_TRIGRAM_LENGTH:
+        queryset = queryset.filter(prefix | Q(search_value__trigram_similar=term)).annotate(
+            prefix_match=Case(
+                When(prefix, then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField(),
+            ),
+            similarity=TrigramSimilarity("search_value", term),
+        ).order_by("prefix_match", "-similarity", field)
+    else:
+        queryset = queryset.filter(prefix).order_by(field)
+
+    rows = list(queryset[offset:offset + limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+class TypeaheadSearchView(LoginRequiredMixin, View, ABC):
+    """
+    Base view for typeahead search endpoints.
+
+    Query parameters:
+        q(str): The search term.
+        page(int): 1-based result page.
+        limit(int): Results per page, at most MAX_LIMIT.
+
+    Return:
+        JsonResponse: results, page and has_more.
+    """
+    search_field = None
+
+    @abstractmethod
+    def get_queryset(self, request, **kwargs) -> QuerySet:
+        """Returns the rows the search is restricted to."""
+
+    @abstractmethod
+    def serialize(self, row) -> dict:
+        """Returns the JSON representation of a result row."""
+
+    def get(self, request, **kwargs) -> JsonResponse:
+        term = request.GET.get("q", "").strip()
+        try:
+            page = max(int(request.GET.get("page", 1)), 1)
+            limit = min(max(int(request.GET.get("limit", DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        except ValueError:
+            return JsonResponse({"error": "page and limit must be integers."}, status=400)
+
+        if not term:
+            return JsonResponse({"results": [], "page": page, "has_more": False})
+
+        rows, has_more = search(
+            self.get_queryset(request, **kwargs),
+            self.search_field,
+            term,
+            limit,
+            (page - 1) * limit,
+        )
+
+        return JsonResponse({
+            "results": [self.serialize(row) for row in rows],
+            "page": page,
+            "has_more": has_more,
+        })
@@ -4,7 +4,8 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import JsonResponse
 from django.views import View
 
-from apps.sponsored_links_reporting.models import AdContainer, KeywordNew
+from apps.sponsored_links.zone_ad_cache import invalidate_container_html
+from apps.sponsored_links_reporting.models import AdContainer
 
 
 class UpdateKeywords(LoginRequiredMixin, View):
@@ -29,8 +30,8 @@ class UpdateKeywords(LoginRequiredMixin, View):
 
             excluded_keywords = ad_container.keywords.exclude(keyword__in=keywords_list)
 
-            for keyword in excluded_keywords:
-                ad_container.keywords.remove(keyword)
+            ad_container.keywords.remove(*excluded_keywords)
+            invalidate_container_html(ad_container.id)
 
             return JsonResponse({"success": "Keywords updated successfully"})
 
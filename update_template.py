@@ -8,8 +8,9 @@ from django.utils.decorators import method_decorator
 from django.views import View
 
 from apps.admin._trafficguard.decorators import json_form_request
-from apps.sponsored_links import fileutils
 from apps.sponsored_links.forms.update_template_request import UpdateTemplateRequest
+from apps.sponsored_links.template_storage import get_template_storage
+from apps.sponsored_links.zone_ad_cache import invalidate_template_html
 from apps.sponsored_links_reporting.models import Template
 
 LOGGER = logging.getLogger(__name__)
@@ -55,12 +56,13 @@ class UpdateTemplate(LoginRequiredMixin, View):
 
             if html:
                 try:
-                    fileutils.upload_to_s3_raw(html, template.path)
+                    get_template_storage().write(template.path, html)
                 except Exception as ex:
                     LOGGER.error(f"Error uploading file to S3: {ex}")
                     return JsonResponse({"error": "Failed to upload file to S3."}, status=500)
 
             template.save()
+            invalidate_template_html(template.id, html or None)
 
             return JsonResponse({"success": "Template updated successfully."}, status=200)
 
@@ -14,6 +14,7 @@ from apps.sponsored_links.load_templates import LoadTemplates
 from apps.sponsored_links.load_template_sizes import LoadTemplateSizes
 from apps.sponsored_links.load_template_html import LoadTemplateHtml
 from apps.sponsored_links.load_owners import LoadOwners
+from apps.sponsored_links.search_owners import SearchOwners
 from apps.sponsored_links.show_templates import ShowTemplates
 from apps.sponsored_links.create_template import CreateTemplate
 from apps.sponsored_links.update_template import UpdateTemplate
@@ -29,9 +30,11 @@ from apps.sponsored_links.delete_zone import DeleteZone
 from apps.sponsored_links.edit_zone import EditZone
 from apps.sponsored_links.load_zone_serving_code import LoadZoneServingCode
 from apps.sponsored_links.load_keywords import LoadKeywords
+from apps.sponsored_links.search_keywords import SearchKeywords
 from apps.sponsored_links.load_ad_data import LoadAdData
 from apps.sponsored_links.update_keywords import UpdateKeywords
 from apps.sponsored_links.load_publisher_revenue_domains import LoadPublisherRevenueDomains
+from apps.sponsored_links.search_publisher_revenue_domains import SearchPublisherRevenueDomains
 from apps.sponsored_links.update_campaign import UpdateCampaign
 from apps.sponsored_links.create_keyword_list import CreateKeywordList
 from apps.sponsored_links.load_keyword_lists import LoadKeywordLists
@@ -40,6 +43,7 @@ from apps.sponsored_links.delete_site import DeleteSite
 from apps.sponsored_links.load_sponsored_links_routing_domains import LoadSponsoredLinksRoutingDomains
 from apps.sponsored_links.show_create_campaign import ShowCreateCampaign
 from apps.sponsored_links.create_ad import CreateAd
+from apps.sponsored_links.load_create_ad_progress import LoadCreateAdProgress
 from apps.sponsored_links.create_campaign import CreateCampaign
 from apps.sponsored_links.load_publisher_routing_domains import LoadPublisherRoutingDomains
 
@@ -131,6 +135,7 @@ urlpatterns = [
         name="sponsored-links-templates",
     ),
     path("load-owners/", LoadOwners.as_view(), name="sponsored-links-templates"),
+    path("search-owners/", SearchOwners.as_view(), name="sponsored-links-search-owners"),
     path(
         "update-template/", UpdateTemplate.as_view(), name="sponsored-links-templates"
     ),
@@ -143,6 +148,11 @@ urlpatterns = [
         LoadPublisherRevenueDomains.as_view(),
         name="sponsored-links-load-revenue-domains",
     ),
+    path(
+        "publisher/<int:user_id>/search-revenue-domains/",
+        SearchPublisherRevenueDomains.as_view(),
+        name="sponsored-links-search-revenue-domains",
+    ),
     path(
         "update-campaign/",
         UpdateCampaign.as_view(),
@@ -177,6 +187,9 @@ urlpatterns = [
     path(
         "load-keywords/", LoadKeywords.as_view(), name="sponsored-links-load-keywords"
     ),
+    path(
+        "search-keywords/", SearchKeywords.as_view(), name="sponsored-links-search-keywords"
+    ),
     path("load-ad-data/", LoadAdData.as_view(), name="sponsored-links-manager"),
     path(
         "update-keywords/",
@@ -203,4 +216,9 @@ urlpatterns = [
         CreateAd.as_view(),
         name="sponsored-links-create-ad",
     ),
+    path(
+        "create-ad/<str:job_id>/progress/",
+        LoadCreateAdProgress.as_view(),
+        name="sponsored-links-create-ad-progress",
+    ),
 ]
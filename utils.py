@@ -5,14 +5,22 @@ import base64
 import collections
 import hashlib
 import logging
+import queue
 import textwrap  # string unident for serving code
+import threading
+import time
 import urllib
 import xml.etree.ElementTree as ET
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
 from rest_framework import status
+from urllib3.util.retry import Retry
 
 from django.conf import settings
+from django.db import connections
 
 from apps.admin._trafficguard.tg_campaign import TgCampaign
 from apps.sponsored_links_reporting.models import (
@@ -52,6 +60,134 @@ class CampaignFinalizationError(Exception):
         return self.message
 
 
+class AdSpeedClient:
+    """
+    A pooled, keep-alive HTTP client for the AdSpeed API.
+
+    A single `requests.Session` is shared by every call so the TCP and TLS
+    connections to `settings.ADSPEED_URL` are reused instead of being re-negotiated
+    per request.
+
+    Attributes:
+        base_url (str): The AdSpeed API endpoint.
+        session (requests.Session): The pooled session used for every call.
+        timeouts (dict): (connect, read) timeouts keyed by AdSpeed API method.
+        default_timeout (tuple): (connect, read) timeout for methods not in `timeouts`.
+    """
+    DEFAULT_TIMEOUT = (5, 60)
+    DEFAULT_TIMEOUTS = {
+        "AS.Ads.createHTML": (5, 120),
+        "AS.Ad.linkToZone": (5, 30),
+        "AS.Ad.getAdTag": (5, 30),
+    }
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(  # noqa: PLR0913
+        self,
+        base_url: str,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeouts: dict | None = None,
+        default_timeout: tuple | None = None,
+    ):
+        """Initiates the AdSpeedClient class with a pooled, retrying session."""
+        self.base_url = base_url
+        self.timeouts = {**self.DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.default_timeout = default_timeout or self.DEFAULT_TIMEOUT
+
+        # POST calls create objects on AdSpeed and are not idempotent, so they are
+        # only retried on connection errors (the request never reached the server).
+        # GET calls are also retried on read errors and on the statuses above.
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get_timeout(self, method: str) -> tuple:
+        """
+        Returns the (connect, read) timeout for an AdSpeed API method.
+
+        Args:
+            method (str): AdSpeed API method, e.g. "AS.Zones.create".
+
+        Return:
+            Tuple
+        """
+        return self.timeouts.get(method, self.default_timeout)
+
+    def post(self, payload: dict) -> requests.Response:
+        """
+        Sends a signed payload to AdSpeed as form data.
+
+        Args:
+            payload (dict): Signed payload, including the "method" key.
+
+        Return:
+            requests.Response
+        """
+        return self.session.post(
+            self.base_url,
+            data=payload,
+            timeout=self.get_timeout(payload["method"]),
+        )
+
+    def get(self, payload: dict, secret: str) -> requests.Response:
+        """
+        Sends a payload to AdSpeed as a query string signed with an MD5 checksum.
+
+        Args:
+            payload (dict): Unsigned payload, including the "method" key.
+            secret (str): The account secret used to sign the payload.
+
+        Return:
+            requests.Response
+        """
+        return self.session.get(
+            self.base_url
+            + "?"
+            + get_raw_string(payload)
+            + "&md5="
+            + checksum(payload, secret),
+            timeout=self.get_timeout(payload["method"]),
+        )
+
+
+_ADSPEED_CLIENT = None
+_ADSPEED_CLIENT_LOCK = threading.Lock()
+
+
+def get_adspeed_client() -> AdSpeedClient:
+    """
+    Returns the process-wide AdSpeedClient, creating it on first use.
+
+    The pool and retry behaviour can be tuned with the optional `ADSPEED_POOL_SIZE`,
+    `ADSPEED_MAX_RETRIES`, `ADSPEED_BACKOFF_FACTOR` and `ADSPEED_TIMEOUTS` settings.
+
+    Return:
+        AdSpeedClient
+    """
+    global _ADSPEED_CLIENT  # noqa: PLW0603
+    if _ADSPEED_CLIENT is None:
+        with _ADSPEED_CLIENT_LOCK:
+            if _ADSPEED_CLIENT is None:
+                _ADSPEED_CLIENT = AdSpeedClient(
+                    settings.ADSPEED_URL,
+                    pool_size=getattr(settings, "ADSPEED_POOL_SIZE", 10),
+                    max_retries=getattr(settings, "ADSPEED_MAX_RETRIES", 3),
+                    backoff_factor=getattr(settings, "ADSPEED_BACKOFF_FACTOR", 0.5),
+                    timeouts=getattr(settings, "ADSPEED_TIMEOUTS", None),
+                )
+    return _ADSPEED_CLIENT
+
+
 def create_zone(name: str, width: int, height: int, site_id: int) -> AdZone:
     """
     Creates a new AdZone and creates it within AdSpeed.
@@ -85,7 +221,7 @@ def create_zone(name: str, width: int, height: int, site_id: int) -> AdZone:
     }
 
     payload["md5"] = checksum(payload, zone.account.secret)
-    response = requests.post(settings.ADSPEED_URL, data=payload, timeout=180)
+    response = get_adspeed_client().post(payload)
     if response.status_code != status.HTTP_200_OK:
         error_message = """Failed to reach AdSpeed API.
           Subsequent steps such as ad container and ads creation will not be executed."""
@@ -127,7 +263,7 @@ def edit_zone(zone_id: int, name: str) -> bool:
         "name": zone_name,
     }
     payload["sig"] = checksum(payload, zone.account.secret)
-    response = requests.post(settings.ADSPEED_URL, data=payload, timeout=180)
+    response = get_adspeed_client().post(payload)
     root = ET.fromstring(response.text)  # noqa: S314
 
     if root.tag != "Error":
@@ -141,6 +277,27 @@ def edit_zone(zone_id: int, name: str) -> bool:
     return False
 
 
+def resolve_keyword_ids(keywords: list) -> tuple:
+    """
+    Resolves keyword strings to KeywordNew IDs with a single query.
+
+    Args:
+        keywords (list): Keyword strings, e.g. the lines of the CreateAd keyword box.
+            Surrounding whitespace (including CR line endings) is stripped and blank lines are ignored.
+
+    Returns:
+        tuple: The resolved keyword IDs, in input order, and the set of keywords that do not exist.
+    """
+    keywords = [kw.strip() for kw in keywords]
+    keywords = [kw for kw in keywords if kw]
+    keyword_map = dict(
+        KeywordNew.objects.filter(keyword__in=set(keywords)).values_list("keyword", "id")
+    )
+    keyword_ids = list(dict.fromkeys(keyword_map[kw] for kw in keywords if kw in keyword_map))
+    missing = {kw for kw in keywords if kw not in keyword_map}
+    return keyword_ids, missing
+
+
 def create_ad_container(  # noqa: PLR0913
     name: str,
     title: str,
@@ -171,75 +328,214 @@ def create_ad_container(  # noqa: PLR0913
         tg_campaign_id=campaign_id,
     )
     errors = {}
-    keywords = KeywordNew.objects.filter(id__in=keyword_ids)
-    if keywords.count() != len(keyword_ids):
+    existing_ids = set(KeywordNew.objects.filter(id__in=keyword_ids).values_list("id", flat=True))
+    missing_ids = set(keyword_ids) - existing_ids
+    if missing_ids:
         errors["Keyword error"] = "One or more keyword IDs do not exist."
+        errors["missing_keyword_ids"] = sorted(missing_ids)
 
-    for keyword in keywords:
-        ad_container.keywords.add(keyword)
+    # A single bulk insert into the through table instead of one add() per keyword.
+    if existing_ids:
+        ad_container.keywords.add(*existing_ids)
 
-    ad_container.refresh_from_db()
     return ad_container, errors
 
 
-def create_ads(ad_container: AdContainer, iterations: int, campaign: TgCampaign) -> None:
+class AccountRateLimiter:
+    """
+    A thread-safe limiter that spaces out AdSpeed calls per AdSpeed account.
+
+    Attributes:
+        calls_per_second (float): Maximum number of calls per second for one account.
+    """
+    def __init__(self, calls_per_second: float):
+        """Initiates the AccountRateLimiter class."""
+        self.calls_per_second = calls_per_second
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, account_id: int) -> None:
+        """
+        Blocks until the given account is allowed to make another call.
+
+        Args:
+            account_id (int): AdspeedAccount ID.
+        """
+        if not self.calls_per_second:
+            return
+
+        interval = 1.0 / self.calls_per_second
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(account_id, now))
+            self._next_slot[account_id] = slot + interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+_RATE_LIMITER = None
+_RATE_LIMITER_LOCK = threading.Lock()
+
+
+def get_rate_limiter() -> AccountRateLimiter:
+    """
+    Returns the process-wide AccountRateLimiter, configured by the optional
+    `ADSPEED_CALLS_PER_SECOND` setting.
+
+    Return:
+        AccountRateLimiter
+    """
+    global _RATE_LIMITER  # noqa: PLW0603
+    if _RATE_LIMITER is None:
+        with _RATE_LIMITER_LOCK:
+            if _RATE_LIMITER is None:
+                _RATE_LIMITER = AccountRateLimiter(getattr(settings, "ADSPEED_CALLS_PER_SECOND", 5))
+    return _RATE_LIMITER
+
+
+_GROUP_LOCK = threading.Lock()
+
+
+def publish_ad(ad: Ad) -> None:
+    """
+    Publishes a single ad iteration to AdSpeed, links it to its zone and assigns it a Group.
+
+    Args:
+        ad (Ad): The ad to publish.
+
+    Raises:
+        CampaignFinalizationError: If AdSpeed rejects the ad.
+    """
+    rate_limiter = get_rate_limiter()
+    account = ad.container.zone.account
+
+    ad.synced = False
+    ad.save()
+    template = ad.container.template
+
+    html = base64.b64encode(bytes(render_ad_wrapper(ad), "utf-8")).decode("utf-8")
+    payload = {
+        "key": account.apikey,
+        "method": "AS.Ads.createHTML",
+        "name": str(ad.id),
+        "htmlbase64": html,
+        "width": template.width,
+        "height": template.height,
+    }
+    payload["md5"] = checksum(payload, account.secret)
+    rate_limiter.wait(account.id)
+    response = get_adspeed_client().post(payload)
+    root = ET.fromstring(response.text)  # noqa: S314
+
+    if root.tag == "Error":
+        error_message = root.find("Message").text if root.find("Message") else "Unknown error"
+        exception_message = f"Error publishing ad to AdSpeed: {error_message}"
+        raise CampaignFinalizationError(exception_message)
+
+    adresp = root.find("Ad")
+    ad.provider_id = adresp.attrib["id"]
+    ad.status = adresp.attrib["status"]
+    ad.synced = True
+    ad.save()
+
+    # Additional ad linking operations
+    rate_limiter.wait(account.id)
+    link_ad_to_zone(ad.id)
+
+    # Groups are filled up to capacity, so concurrent workers must not pick the same slot.
+    with _GROUP_LOCK:
+        group = Group.get_available_or_create_new()
+        group.link_ad(ad)
+
+
+def _publish_ads_in_thread(pending: queue.SimpleQueue, results: queue.SimpleQueue) -> None:
+    """
+    Runs `publish_ad` in a worker thread for ads taken from `pending` until it is
+    empty, and puts each ad with its exception (None when it was synced) on
+    `results`. The thread's DB connections are reused across its ads and released
+    once at the end.
+    """
+    try:
+        while True:
+            try:
+                ad = pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                publish_ad(ad)
+            except Exception as ex:  # noqa: BLE001
+                results.put((ad, ex))
+            else:
+                results.put((ad, None))
+    finally:
+        connections.close_all()
+
+
+def create_ads(
+    ad_container: AdContainer,
+    iterations: int,
+    campaign: TgCampaign,
+    workers: int | None = None,
+    on_result: Callable[[Ad, str | None], None] | None = None,
+) -> None:
     """
     Creates ad iterations and attempts to sync them with AdSpeed.
 
+    With more than one worker the iterations are published concurrently. Calls are
+    still throttled per AdSpeed account by `get_rate_limiter`.
+
     Args:
         ad_container (AdContainer): The container to which ads belong.
         iterations (int): Number of ads to create.
         campaign (TgCampaign): The associated campaign.
+        workers (int): Number of concurrent publishers, defaults to the
+            `ADSPEED_PUBLISH_WORKERS` setting.
+        on_result (Callable): Optional callback invoked with each ad and its error
+            message (None when the ad was synced).
 
     Raises:
         Exception: If there is an issue with ad creation or syncing.
     """
-
-    def raise_campaign_error(message: str) -> None:
-        """Raises a CampaignFinalizationError with the given message."""
-        raise CampaignFinalizationError(message)
+    if workers is None:
+        workers = getattr(settings, "ADSPEED_PUBLISH_WORKERS", 4)
 
     errors = []
     ads = ad_container.create_ads(iterations, campaign)
-    for ad in ads:
-        try:
-            ad.synced = False
-            ad.save()
-            template = ad.container.template
-
-            html = base64.b64encode(bytes(render_ad_wrapper(ad), "utf-8")).decode("utf-8")
-            payload = {
-                "key": ad.container.zone.account.apikey,
-                "method": "AS.Ads.createHTML",
-                "name": str(ad.id),
-                "htmlbase64": html,
-                "width": template.width,
-                "height": template.height,
-            }
-            payload["md5"] = checksum(payload, ad.container.zone.account.secret)
-            response = requests.post(settings.ADSPEED_URL, data=payload, timeout=180)
-            root = ET.fromstring(response.text)  # noqa: S314
-
-            if root.tag == "Error":
-                error_message = root.find("Message").text if root.find("Message") else "Unknown error"
-                exception_message = f"Error publishing ad to AdSpeed: {error_message}"
-                raise_campaign_error(exception_message)
-
-            adresp = root.find("Ad")
-            ad.provider_id = adresp.attrib["id"]
-            ad.status = adresp.attrib["status"]
-            ad.synced = True
-            ad.save()
-
-            # Additional ad linking operations
-            link_ad_to_zone(ad.id)
-            group = Group.get_available_or_create_new()
-            group.link_ad(ad)
-
-        except CampaignFinalizationError as ex:
-            # Collect error messages for each ad
-            errors.append(str(ex))
-            continue
+
+    def collect(ad: Ad, error: str | None) -> None:
+        """Collects the error message for each ad and reports the result."""
+        if error is not None:
+            errors.append(error)
+        if on_result is not None:
+            on_result(ad, error)
+
+    if workers <= 1:
+        for ad in ads:
+            try:
+                publish_ad(ad)
+            except CampaignFinalizationError as ex:
+                collect(ad, str(ex))
+            else:
+                collect(ad, None)
+    else:
+        pending = queue.SimpleQueue()
+        for ad in ads:
+            pending.put(ad)
+        results = queue.SimpleQueue()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for _ in range(min(workers, len(ads))):
+                executor.submit(_publish_ads_in_thread, pending, results)
+            # Results are reported from this thread, in the order the ads finish.
+            for _ in ads:
+                ad, ex = results.get()
+                if ex is None:
+                    collect(ad, None)
+                elif isinstance(ex, CampaignFinalizationError):
+                    collect(ad, str(ex))
+                else:
+                    raise ex
 
     if errors:
         raise CampaignFinalizationError("Failed to create or sync one or more ads: " + "; ".join(errors))
@@ -307,14 +603,7 @@ def link_ad_to_zone(ad_id: int) -> bool:
         "zone": ad.container.zone.provider_id,
         "token": token,
     }
-    response = requests.get(
-        settings.ADSPEED_URL
-        + "?"
-        + get_raw_string(payload)
-        + "&md5="
-        + checksum(payload, ad.container.zone.account.secret),
-        timeout=180,
-    )
+    response = get_adspeed_client().get(payload, ad.container.zone.account.secret)
     root = ET.fromstring(response.text)  # noqa: S314
     is_confirmed = root.find("Confirmation")
 
@@ -365,14 +654,7 @@ def get_ad_serving_code(ad: Ad) -> str:
         "height": ad.container.template.height,
         "format": "javascript",
     }
-    response = requests.get(
-        settings.ADSPEED_URL
-        + "?"
-        + get_raw_string(payload)
-        + "&md5="
-        + checksum(payload, ad.container.zone.account.secret),
-        timeout=180,
-    )
+    response = get_adspeed_client().get(payload, ad.container.zone.account.secret)
     root = ET.fromstring(response.text)  # noqa: S314
     html = root.find("Ad").find("ServingCode").text  # TODO exception handling!
     # remove empty lines and unident serving code
@@ -9,17 +9,18 @@ White Label-related functionalities, including:
 - Generating reports
 """
 
+import csv
 import json
 import re
+from collections.abc import Iterable, Iterator
 from datetime import datetime
 
-import pandas as pd
 from django_tables2 import RequestConfig
 
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.models import User
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.http import HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
 from django.utils import timezone
 from django.utils.decorators import method_decorator
@@ -30,7 +31,7 @@ from apps.accounting.views import ApiView
 from apps.admin._trafficguard.decorators import has_permissions, json_form_request
 from apps.data.models import CrossroadPermission, RevenueCalcType
 from apps.dwh.tasks import deactivate_whitelabel_configuration
-from apps.main_app.helpers import DownloadCsv, df_to_list_dict, get_summary_table_dates
+from apps.main_app.helpers import get_summary_table_dates
 from apps.whitelabel.form_requests.add_admin import AddAdmin
 from apps.whitelabel.form_requests.associate_publisher import AssociatePublisher
 from apps.whitelabel.form_requests.updated_white_label_settings import (
@@ -52,6 +53,55 @@ from apps.whitelabel.tables import (
 from apps.whitelabel.wl_reports import WlReportManager
 
 
+WL_REPORT_PER_PAGE = 100
+
+WL_REPORT_EXPORT_COLUMNS = {
+    "username": "Username",
+    "bucket": "Bucket",
+    "total_visitors__sum": "Gross Visitors",
+    "tracked_visitors__sum": "Tracked Visitors",
+    "owner_rev": "Partner Revenue",
+    "pub_client_rev": "Publisher Revenue",
+    "diff": "Partner Profit",
+}
+
+
+class _EchoBuffer:
+    """A file-like object whose write returns the value instead of buffering it."""
+
+    def write(self: "_EchoBuffer", value: str) -> str:
+        """Returns the written value so csv.writer output can be streamed."""
+        return value
+
+
+class StreamingCsv:
+    """
+    Streams rows as a CSV download without holding the file in memory.
+
+    rows: An iterable of dicts, consumed lazily while the response is sent.
+    columns: Mapping of row keys to CSV header labels, in output order.
+    file_name: The download file name without extension.
+    """
+    def __init__(self: "StreamingCsv", rows: Iterable[dict], columns: dict, file_name: str) -> None:
+        """Initiates the StreamingCsv class."""
+        self.rows = rows
+        self.columns = columns
+        self.file_name = file_name
+
+    def iter_lines(self: "StreamingCsv") -> Iterator[str]:
+        """Yields the header and then one CSV line per row."""
+        writer = csv.writer(_EchoBuffer())
+        yield writer.writerow(self.columns.values())
+        for row in self.rows:
+            yield writer.writerow(row.get(key) for key in self.columns)
+
+    def download(self: "StreamingCsv") -> StreamingHttpResponse:
+        """Returns the streaming CSV attachment response."""
+        response = StreamingHttpResponse(self.iter_lines(), content_type="text/csv")
+        response["Content-Disposition"] = f'attachment; filename="{self.file_name}.csv"'
+        return response
+
+
 class WhiteLabelIndex(LoginRequiredMixin, View):
     """
     - View for displaying the White Label configurations index page
@@ -273,42 +323,19 @@ class WhiteLabelPubReport(LoginRequiredMixin, View):
         ):
             return HttpResponse("No permission to access page!")
         report_manager = WlReportManager(config, start_date, end_date)
-        try:
-            data = report_manager.get_reports()
-        except ValueError as e:
-            data = report_manager.empty_df()
-            return e
 
         if request.GET.get("export", "false").lower() == "true":
-            with pd.option_context("display.float_format", "${:,.2f}".format):
-                data = data[
-                    [
-                        "username",
-                        "bucket",
-                        "total_visitors__sum",
-                        "tracked_visitors__sum",
-                        "owner_rev",
-                        "pub_client_rev",
-                        "diff",
-                    ]
-                ]
-                data.rename(
-                    columns={
-                        "username": "Username",
-                        "total_visitors__sum": "Gross Visitors",
-                        "tracked_visitors__sum": "Tracked Visitors",
-                        "owner_rev": "Partner Revenue",
-                        "pub_client_rev": "Publisher Revenue",
-                        "diff": "Partner Profit",
-                    },
-                )
-                return DownloadCsv(
-                    data_frame=data,
-                    file_name=f"wl_publisher_report_{start_date}-{end_date}",
-                ).download()
-
-        table = WlPublisherReportTable(df_to_list_dict(data))
-        RequestConfig(request, paginate={"per_page": 99999}).configure(table)
+            return StreamingCsv(
+                rows=report_manager.iter_summary_rows(),
+                columns=WL_REPORT_EXPORT_COLUMNS,
+                file_name=f"wl_publisher_report_{start_date}-{end_date}",
+            ).download()
+
+        table = WlPublisherReportTable(
+            report_manager.get_summary_queryset(),
+            totals=report_manager.get_summary_totals(),
+        )
+        RequestConfig(request, paginate={"per_page": WL_REPORT_PER_PAGE}).configure(table)
 
         context = {
             "table": table,
@@ -364,7 +391,7 @@ class LoadWhiteLabelSettings(ApiView):
                 "id": wl_publisher.id,
                 "bucket": wl_publisher.get_bucket_display(),
             }
-            for wl_publisher in WLPublisher.objects.filter(configuration=config)
+            for wl_publisher in WLPublisher.objects.filter(configuration=config).select_related("publisher")
         ]
 
         return JsonResponse(
@@ -1,9 +1,8 @@
 from apps.data.models import ReportSummary
 from apps.data.trafficguard.models import CampaignSummary
-from django.db.models import Sum
+from django.db.models import F, OuterRef, Subquery, Sum
 import pandas as pd
-from apps.main_app.wl_rulebook import WhiteLabelRuleBookMultiPublishers
-from django.contrib.auth.models import User
+from apps.whitelabel.models import WLDailySummary, WLPublisher, WLShareRule
 
 class WlReportManager():
 
@@ -12,14 +11,13 @@ class WlReportManager():
         self.wl_configuration = wl_configuration
         self.wlpublisher_df = pd.DataFrame([
             {
-                'publisher_id': wl_publisher.publisher.id,
+                'publisher_id': wl_publisher.publisher_id,
                 'bucket': wl_publisher.get_bucket_display()
             }
             for wl_publisher in self.wl_configuration.wlpublisher_set.all()
         ], columns=['publisher_id', 'bucket'])
         self.start_date = start_date
         self.end_date = end_date
-        self.wl_rulebook = WhiteLabelRuleBookMultiPublishers()
 
     def get_tg_reports(self):
         # after WL revshare (synced to campaigns)
@@ -33,32 +31,119 @@ class WlReportManager():
             .values('date','pub_client_rev', 'total_visitors__sum', 'tracked_visitors__sum',  'crossroads_user_id')
         )
 
-        df = pd.DataFrame(list(reports))
+        df = pd.DataFrame(
+            list(reports),
+            columns=['date', 'pub_client_rev', 'total_visitors__sum', 'tracked_visitors__sum', 'crossroads_user_id'],
+        )
         df = df.merge(self.wlpublisher_df, how='left', left_on='crossroads_user_id', right_on='publisher_id')
         return df
 
-    def get_owner_rev(self, row):
-        return self.wl_rulebook.apply_rule_reverse(row['crossroads_user_id'], row['date'],row['pub_client_rev'] )
+    def get_share_rules(self):
+        # every active rule that can be in effect during the report window, loaded once
+        rules = pd.DataFrame(
+            list(
+                WLShareRule.objects.filter(
+                    owner_id__in=self.wlpublisher_df.publisher_id.unique().tolist(),
+                    date_effective__lte=self.end_date,
+                    active=True,
+                ).values('owner_id', 'date_effective', 'percentage')
+            ),
+            columns=['owner_id', 'date_effective', 'percentage'],
+        )
+        rules['owner_id'] = rules['owner_id'].astype('int64')
+        rules['date_effective'] = pd.to_datetime(rules['date_effective'])
+        rules['percentage'] = rules['percentage'].astype(float)
+        return rules.sort_values('date_effective')
 
+    def apply_rules_reverse(self, df):
+        """
+        Reverses the publisher revenue of each (publisher, date) row to the owner
+        revenue, pub_client_rev / percentage of the share rule in effect that day.
+        Replaces the per-row WhiteLabelRuleBookMultiPublishers.apply_rule_reverse,
+        parity is covered by tests.ShareRuleReversalParity.
 
-    def cal_diff (self, row):
-        try:
-            return float(row['owner_rev']) - float(row['pub_client_rev'])
-        except:
-            return 0.0
-    def get_reports(self):
+        The rule in effect is the active rule of the publisher with the latest
+        date_effective on or before the row date (an as-of join), so:
+        - inactive rules are ignored, an earlier active rule applies instead;
+        - rows before the first active rule, or without rules, keep a 100% share;
+        - a percentage of 0 or below is treated as a 100% share, never divided by.
+        The result is stored in WLDailySummary, so a change here needs a backfill.
+        """
+        df = df.copy()
+        df['crossroads_user_id'] = df['crossroads_user_id'].astype('int64')
+        df['date'] = pd.to_datetime(df['date'])
+        df = pd.merge_asof(
+            df.sort_values('date'),
+            self.get_share_rules(),
+            left_on='date',
+            right_on='date_effective',
+            left_by='crossroads_user_id',
+            right_by='owner_id',
+            direction='backward',
+        )
+        percentage = df['percentage'].fillna(1.0)
+        percentage = percentage.where(percentage > 0, 1.0)
+        df['pub_client_rev'] = df['pub_client_rev'].astype(float)
+        df['owner_rev'] = df['pub_client_rev'] / percentage
+        return df
 
-        df = self.get_tg_reports()
-        df['owner_rev'] = df.apply(self.get_owner_rev, axis=1)
-        users = pd.DataFrame(list(User.objects.filter(id__in=df['crossroads_user_id'].unique().tolist() ).values('username', 'id') ))
-        df = df.merge(users, left_on='crossroads_user_id', right_on='id', how='left')
-        df = df.groupby(['crossroads_user_id', 'username', 'bucket']).sum().reset_index()
-        df['diff'] = df.apply(self.cal_diff, axis=1)
+    def get_summary_rows(self):
+        # pre-aggregated WLDailySummary rows kept fresh by wl_summary, current publishers only
+        return WLDailySummary.objects.filter(
+            configuration=self.wl_configuration,
+            date__range=(self.start_date, self.end_date),
+            publisher_id__in=self.wl_configuration.wlpublisher_set.values('publisher_id'),
+        )
 
-        df['diff'] = df['diff'].round(decimals=2)
-        df['owner_rev'] = df['owner_rev'].round(decimals=2)
-        return df
+    def get_summary_queryset(self):
+        # per publisher totals, computed and sortable in the database
+        bucket = WLPublisher.objects.filter(
+            configuration=self.wl_configuration,
+            publisher_id=OuterRef('publisher_id'),
+        ).values('bucket')[:1]
+        return (
+            self.get_summary_rows()
+            .values('publisher_id')
+            .annotate(
+                crossroads_user_id=F('publisher_id'),
+                username=F('publisher__username'),
+                bucket=Subquery(bucket),
+                total_visitors__sum=Sum('total_visitors'),
+                tracked_visitors__sum=Sum('tracked_visitors'),
+                pub_client_rev=Sum('pub_client_rev'),
+                owner_rev=Sum('owner_rev'),
+                diff=Sum('owner_rev') - Sum('pub_client_rev'),
+            )
+        )
 
+    def get_summary_totals(self):
+        # report footer totals in a single aggregate query
+        totals = self.get_summary_rows().aggregate(
+            owner_rev=Sum('owner_rev'),
+            pub_client_rev=Sum('pub_client_rev'),
+        )
+        owner_rev = float(totals['owner_rev'] or 0)
+        pub_client_rev = float(totals['pub_client_rev'] or 0)
+        return {
+            'owner_rev': owner_rev,
+            'pub_client_rev': pub_client_rev,
+            'diff': owner_rev - pub_client_rev,
+        }
 
-    def empty_df(self):
-        return pd.DataFrame()
+    def iter_summary_rows(self, chunk_size=2000):
+        # streams the summary report one publisher at a time without building a DataFrame
+        buckets = WLPublisher.objects.get_buckets_dict()
+        reports = self.get_summary_queryset().order_by('username')
+        for report in reports.iterator(chunk_size=chunk_size):
+            owner_rev = round(float(report['owner_rev'] or 0), 2)
+            pub_client_rev = float(report['pub_client_rev'] or 0)
+            yield {
+                'crossroads_user_id': report['crossroads_user_id'],
+                'username': report['username'],
+                'bucket': buckets.get(report['bucket']),
+                'total_visitors__sum': report['total_visitors__sum'],
+                'tracked_visitors__sum': report['tracked_visitors__sum'],
+                'owner_rev': owner_rev,
+                'pub_client_rev': pub_client_rev,
+                'diff': round(owner_rev - pub_client_rev, 2),
+            }
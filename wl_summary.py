@@ -0,0 +1,247 @@
+"""
+Maintains the `WLDailySummary` table used by the white label publisher report.
+
+The summary is refreshed per date: whenever a revenue ingestion task finishes,
+only the dates it touched are recomputed for every white label configuration.
+
+Partner revenue also depends on the share rules and on which publishers belong
+to a configuration, so those writes refresh the affected publishers too:
+- a share rule saved or deleted: its owner, from `date_effective` on
+- a publisher associated with a configuration: its whole revenue history
+- a publisher removed from a configuration: its summary rows are deleted
+
+The handlers are connected when the app is ready (see `WhitelabelConfig`).
+Bulk updates bypass the signals and call `queue_publisher_refresh` directly.
+"""
+import logging
+import re
+from datetime import date, datetime, timedelta
+
+from celery import shared_task
+from celery.signals import task_success
+
+from django.db import transaction
+from django.db.models import Min
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from apps.data.trafficguard.models import CampaignSummary
+from apps.whitelabel.models import WhiteLabelConfiguration, WLDailySummary, WLPublisher, WLShareRule
+from apps.whitelabel.wl_reports import WlReportManager
+
+LOGGER = logging.getLogger(__name__)
+
+# e.g. api_visymo.tasks.process_visymo_revenue_date or
+# api_tapstone.tasks.process_tapstone_revenue_seven_days_rsoc
+REVENUE_TASK_PATTERN = re.compile(
+    r"\.process_\w+?_revenue_(?P<window>date|yesterday|intraday|seven_days)(_rsoc)?$"
+)
+
+
+def dates_touched_by(task_name: str, args: tuple) -> list:
+    """
+    Returns the reporting dates a revenue ingestion task has (re)processed.
+
+    Args:
+        task_name: The dotted Celery task name.
+        args: The positional arguments the task was called with.
+
+    Returns:
+        A list of dates, empty if the task is not a revenue ingestion task.
+    """
+    match = REVENUE_TASK_PATTERN.search(task_name or "")
+    if not match:
+        return []
+
+    today = timezone.now().date()
+    window = match.group("window")
+    if window == "date":
+        return [datetime.strptime(str(args[0]), "%Y-%m-%d").date()] if args else []
+    if window == "intraday":
+        return [today]
+    if window == "yesterday":
+        return [today - timedelta(days=1)]
+    return [today - timedelta(days=days) for days in range(1, 8)]
+
+
+def parse_date(value: date | str) -> date:
+    """Returns a date from a date or a "YYYY-MM-DD" string."""
+    return value if isinstance(value, date) else datetime.strptime(str(value), "%Y-%m-%d").date()
+
+
+def date_range(start: date, end: date) -> list:
+    """Returns every date from start through end."""
+    return [start + timedelta(days=days) for days in range((end - start).days + 1)]
+
+
+def refresh_wl_daily_summary(
+    dates: list,
+    configuration_ids: list | None = None,
+    publisher_ids: list | None = None,
+) -> int:
+    """
+    Recomputes the `WLDailySummary` rows of the given dates.
+
+    Args:
+        dates: The dates to refresh.
+        configuration_ids: Optionally limit the refresh to these configurations.
+        publisher_ids: Optionally limit the refresh to these publishers.
+
+    Returns:
+        The number of summary rows written.
+    """
+    dates = sorted(set(dates))
+    if not dates:
+        return 0
+
+    configurations = WhiteLabelConfiguration.objects.all()
+    if configuration_ids is not None:
+        configurations = configurations.filter(id__in=configuration_ids)
+    if publisher_ids is not None:
+        configurations = configurations.filter(wlpublisher__publisher_id__in=publisher_ids).distinct()
+
+    written = 0
+    for configuration in configurations:
+        report_manager = WlReportManager(configuration, dates[0], dates[-1])
+        if publisher_ids is not None:
+            wlpublisher_df = report_manager.wlpublisher_df
+            report_manager.wlpublisher_df = wlpublisher_df[wlpublisher_df['publisher_id'].isin(publisher_ids)]
+
+        stale = WLDailySummary.objects.filter(configuration=configuration, date__in=dates)
+        if publisher_ids is not None:
+            stale = stale.filter(publisher_id__in=publisher_ids)
+
+        rows = []
+        if not report_manager.wlpublisher_df.empty:
+            df = report_manager.get_tg_reports()
+            df = df[df['date'].isin(dates)]
+            if not df.empty:
+                df = report_manager.apply_rules_reverse(df)
+                df = df.groupby(['crossroads_user_id', 'date'])[
+                    ['total_visitors__sum', 'tracked_visitors__sum', 'pub_client_rev', 'owner_rev']
+                ].sum().reset_index()
+                rows = [
+                    WLDailySummary(
+                        configuration=configuration,
+                        publisher_id=row.crossroads_user_id,
+                        date=row.date.date(),
+                        total_visitors=row.total_visitors__sum or 0,
+                        tracked_visitors=row.tracked_visitors__sum or 0,
+                        pub_client_rev=round(row.pub_client_rev, 4),
+                        owner_rev=round(row.owner_rev, 4),
+                    )
+                    for row in df.itertuples(index=False)
+                ]
+
+        with transaction.atomic():
+            stale.delete()
+            WLDailySummary.objects.bulk_create(rows, batch_size=1000)
+        written += len(rows)
+
+    return written
+
+
+@shared_task
+def refresh_wl_daily_summary_task(dates: list, configuration_ids: list | None = None) -> int:
+    """
+    Celery entry point for `refresh_wl_daily_summary`.
+
+    Args:
+        dates: Dates as "YYYY-MM-DD" strings.
+        configuration_ids: Optionally limit the refresh to these configurations.
+
+    Returns:
+        The number of summary rows written.
+    """
+    dates = [parse_date(d) for d in dates]
+    written = refresh_wl_daily_summary(dates, configuration_ids)
+    LOGGER.info("Refreshed %s white label summary rows for %s", written, dates)
+    return written
+
+
+@task_success.connect
+def refresh_after_revenue_ingestion(sender=None, **kwargs) -> None:  # noqa: ANN001, ARG001
+    """Queues a summary refresh for the dates touched by a finished revenue ingestion task."""
+    if sender is None:
+        return
+    dates = dates_touched_by(sender.name, sender.request.args or ())
+    if dates:
+        refresh_wl_daily_summary_task.delay([d.strftime("%Y-%m-%d") for d in dates])
+
+
+def first_revenue_date(publisher_ids: list) -> date | None:
+    """Returns the first date with revenue for any of the publishers, None without revenue."""
+    first = CampaignSummary.objects.filter(crossroads_user_id__in=publisher_ids).aggregate(Min('date'))['date__min']
+    if isinstance(first, datetime):
+        return first.date()
+    return first
+
+
+@shared_task
+def refresh_wl_publishers_summary_task(
+    publisher_ids: list,
+    since: str | None = None,
+    chunk_days: int = 31,
+) -> int:
+    """
+    Recomputes the summary rows of publishers from a date through today, one
+    chunk of dates at a time.
+
+    Args:
+        publisher_ids: The publishers to refresh in every configuration they belong to.
+        since: The first date as "YYYY-MM-DD", defaults to their first revenue date.
+        chunk_days: The number of dates recomputed at once.
+
+    Returns:
+        The number of summary rows written.
+    """
+    start = parse_date(since) if since else first_revenue_date(publisher_ids)
+    if start is None:
+        return 0
+
+    dates = date_range(start, timezone.now().date())
+    written = 0
+    for offset in range(0, len(dates), chunk_days):
+        written += refresh_wl_daily_summary(dates[offset:offset + chunk_days], publisher_ids=publisher_ids)
+    LOGGER.info("Refreshed %s white label summary rows for publishers %s since %s", written, publisher_ids, start)
+    return written
+
+
+def queue_publisher_refresh(publisher_ids: list, since: date | str | None = None) -> None:
+    """
+    Queues `refresh_wl_publishers_summary_task` once the current transaction commits.
+
+    Args:
+        publisher_ids: The publishers to refresh.
+        since: The first date to refresh, defaults to their first revenue date.
+    """
+    publisher_ids = sorted(set(publisher_ids))
+    if not publisher_ids:
+        return
+    since = parse_date(since).strftime("%Y-%m-%d") if since else None
+    transaction.on_commit(lambda: refresh_wl_publishers_summary_task.delay(publisher_ids, since))
+
+
+def share_rule_changed(sender, instance, **kwargs) -> None:  # noqa: ANN001, ARG001
+    """Refreshes the rule owner from the rule's effective date on."""
+    queue_publisher_refresh([instance.owner_id], instance.date_effective)
+
+
+def wl_publisher_saved(sender, instance, created=False, **kwargs) -> None:  # noqa: ANN001, ARG001
+    """Fills in the history of a newly associated publisher."""
+    if created:
+        queue_publisher_refresh([instance.publisher_id])
+
+
+def wl_publisher_deleted(sender, instance, **kwargs) -> None:  # noqa: ANN001, ARG001
+    """Removes the summary rows of a publisher removed from a configuration."""
+    WLDailySummary.objects.filter(
+        configuration_id=instance.configuration_id,
+        publisher_id=instance.publisher_id,
+    ).delete()
+
+
+post_save.connect(share_rule_changed, sender=WLShareRule, dispatch_uid="wl_summary_share_rule_saved")
+post_delete.connect(share_rule_changed, sender=WLShareRule, dispatch_uid="wl_summary_share_rule_deleted")
+post_save.connect(wl_publisher_saved, sender=WLPublisher, dispatch_uid="wl_summary_publisher_saved")
+post_delete.connect(wl_publisher_deleted, sender=WLPublisher, dispatch_uid="wl_summary_publisher_deleted")
@@ -0,0 +1,141 @@
+"""
+Caches the rendered HTML of ad containers for `LoadZoneAdHtml` previews.
+
+Rendered HTML is keyed on the container id, the container's keyword set
+version, a global keyword edit epoch and the template content hash, so any of
+the following produces a new key instead of serving stale HTML:
+- `UpdateKeywords` or any other change to a container's keywords (m2m_changed)
+- `UpdateTemplate` storing new HTML or moving the template
+- a keyword being edited or deleted
+
+The signal handlers are connected by `SponsoredLinksConfig.ready`, so keyword
+edits from Celery workers and management commands invalidate previews too.
+
+The template hash is cached with a finite TTL (`ZONE_AD_TEMPLATE_HASH_TTL`), so
+a template changed outside `UpdateTemplate` is picked up once it expires.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from apps.sponsored_links import fileutils
+from apps.sponsored_links.template_engine import keyword_context, render_template
+from apps.sponsored_links.template_storage import get_template_storage
+from apps.sponsored_links_reporting.models import AdContainer, KeywordNew
+
+KEYWORDS_EPOCH_KEY = "sl:zone-ad-html:keywords-epoch"
+
+
+def _container_version_key(container_id: int) -> str:
+    return f"sl:zone-ad-html:container:{container_id}"
+
+
+def _template_hash_key(template_id: int) -> str:
+    return f"sl:zone-ad-html:template:{template_id}"
+
+
+def _template_hash_ttl() -> int:
+    return getattr(settings, "ZONE_AD_TEMPLATE_HASH_TTL", 300)
+
+
+def _bump(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def invalidate_container_html(container_id: int) -> None:
+    """
+    Invalidates the rendered HTML of a container after its keywords changed.
+
+    Args:
+        container_id (int): AdContainer ID.
+    """
+    _bump(_container_version_key(container_id))
+
+
+def invalidate_template_html(template_id: int, html: str | None = None) -> None:
+    """
+    Invalidates the rendered HTML of every container using a template.
+
+    The hash of the HTML that was just written is stored directly, so no process
+    re-reads (and possibly re-hashes an older copy of) the template to find it.
+
+    Args:
+        template_id (int): Template ID.
+        html (str): The template HTML just written, None when only its path changed.
+    """
+    if html is None:
+        cache.delete(_template_hash_key(template_id))
+    else:
+        cache.set(_template_hash_key(template_id), fileutils.content_hash(html), timeout=_template_hash_ttl())
+
+
+def invalidate_keywords_html() -> None:
+    """Invalidates all rendered HTML after a keyword was edited or deleted."""
+    _bump(KEYWORDS_EPOCH_KEY)
+
+
+def get_rendered_container_html(ad_container: AdContainer) -> str:
+    """
+    Returns the rendered template HTML of a container, rendering it on a cache miss.
+
+    Args:
+        ad_container (AdContainer): The container to render.
+
+    Return:
+        String
+    """
+    template = ad_container.template
+    storage = get_template_storage()
+    container_version_key = _container_version_key(ad_container.id)
+    template_hash_key = _template_hash_key(template.id)
+    versions = cache.get_many([container_version_key, template_hash_key, KEYWORDS_EPOCH_KEY])
+
+    source = None
+    template_hash = versions.get(template_hash_key)
+    if template_hash is None:
+        source = storage.read(template.path)
+        template_hash = fileutils.content_hash(source)
+        cache.set(template_hash_key, template_hash, timeout=_template_hash_ttl())
+
+    key = (
+        f"sl:zone-ad-html:{ad_container.id}:{versions.get(container_version_key, 0)}"
+        f":{versions.get(KEYWORDS_EPOCH_KEY, 0)}:{template_hash}"
+    )
+    html = cache.get(key)
+    if html is None:
+        if source is None:
+            source = storage.read(template.path)
+        keywords = ad_container.keywords.values_list("keyword", flat=True)
+        html = render_template(template.id, source, keyword_context(keywords), version=template_hash)
+        cache.set(key, html, timeout=getattr(settings, "ZONE_AD_HTML_CACHE_TTL", 3600))
+    return html
+
+
+def _container_keywords_changed(sender, instance, action, reverse, pk_set, **kwargs) -> None:  # noqa: ANN001, ARG001
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # Changed from the keyword side, e.g. keyword.adcontainer_set.add(...)
+        for container_id in pk_set or ():
+            invalidate_container_html(container_id)
+        if action == "post_clear":
+            invalidate_keywords_html()
+    else:
+        invalidate_container_html(instance.pk)
+
+
+def _keyword_changed(sender, instance, created=False, **kwargs) -> None:  # noqa: ANN001, ARG001
+    if not created:
+        invalidate_keywords_html()
+
+
+m2m_changed.connect(
+    _container_keywords_changed,
+    sender=AdContainer.keywords.through,
+    dispatch_uid="zone_ad_html_container_keywords",
+)
+post_save.connect(_keyword_changed, sender=KeywordNew, dispatch_uid="zone_ad_html_keyword_saved")
+post_delete.connect(_keyword_changed, sender=KeywordNew, dispatch_uid="zone_ad_html_keyword_deleted")